@@ -2,11 +2,15 @@
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 # Load env so imports elsewhere always see DATABASE_URL
@@ -15,13 +19,37 @@ load_dotenv(Path(__file__).resolve().parent / ".env")       # backend/app/.env (
 
 DATABASE_URL: str = (os.getenv("DATABASE_URL") or "").strip()
 
+# DB_ASYNC=1 serves the saved-search API from an async engine (asyncpg / aiosqlite)
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+# Pool knobs (per worker; ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5") or 5)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10") or 0)
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10") or 10)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800") or -1)
+# Prepared statements cached per connection (asyncpg, sqlite3); 0 disables
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256") or 0)
+
 Base = declarative_base()
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _pool_kwargs() -> dict:
+    if IS_SQLITE and (DATABASE_URL.rstrip("/").endswith(":") or ":memory:" in DATABASE_URL):
+        return {}  # why: in-memory SQLite uses a per-thread pool without size limits
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
 # Engine config (SQLite needs special connect args for threaded servers)
 connect_args = {}
 pool_pre_ping = True
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}  # why: uvicorn threads + SQLite
+if IS_SQLITE:
+    connect_args = {"check_same_thread": False, "cached_statements": DB_STATEMENT_CACHE_SIZE}  # why: uvicorn threads + SQLite
     pool_pre_ping = False
 
 _engine = create_engine(
@@ -29,6 +57,7 @@ _engine = create_engine(
     future=True,
     pool_pre_ping=pool_pre_ping,
     connect_args=connect_args,
+    **_pool_kwargs(),
 ) if DATABASE_URL else None
 
 _SessionLocal = sessionmaker(
@@ -39,6 +68,40 @@ _SessionLocal = sessionmaker(
 ) if _engine else None
 
 
+def _async_url(url: str) -> str:
+    """Same database through its async driver: asyncpg for Postgres, aiosqlite for SQLite."""
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend == "postgresql":
+        u = u.set(drivername="postgresql+asyncpg")
+        if DB_STATEMENT_CACHE_SIZE >= 0:
+            u = u.update_query_dict({"prepared_statement_cache_size": str(DB_STATEMENT_CACHE_SIZE)})
+    elif backend == "sqlite":
+        u = u.set(drivername="sqlite+aiosqlite")
+    return u.render_as_string(hide_password=False)
+
+
+def _build_async_engine():
+    try:
+        import greenlet  # noqa: F401  # why: SQLAlchemy's asyncio layer needs it at first query
+        engine = create_async_engine(
+            _async_url(DATABASE_URL),
+            pool_pre_ping=pool_pre_ping,
+            connect_args={"cached_statements": DB_STATEMENT_CACHE_SIZE} if IS_SQLITE else {},
+            **_pool_kwargs(),
+        )
+    except Exception as e:  # driver (asyncpg/aiosqlite) or greenlet missing
+        print(f"[db] DB_ASYNC=1 but async engine unavailable ({e}); using the sync engine")
+        return None, None
+    return engine, async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+_async_engine, _AsyncSessionLocal = _build_async_engine() if (DATABASE_URL and DB_ASYNC) else (None, None)
+
+# True when the saved-search router should use the async handlers
+ASYNC_ENABLED = _AsyncSessionLocal is not None
+
+
 def get_db() -> Generator[Session, None, None]:
     if not _SessionLocal:
         raise RuntimeError("DATABASE_URL not set; saved-search API disabled")
@@ -49,9 +112,69 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def create_all() -> None:
-    if _engine:
-        Base.metadata.create_all(_engine)
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    if not _AsyncSessionLocal:
+        raise RuntimeError("async database engine not configured (DB_ASYNC=1 + driver)")
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+def get_engine():
+    """The sync engine (None when DATABASE_URL is unset)."""
+    return _engine
+
+
+def _pg_index_names(conn) -> set[str]:
+    return {name for (name,) in conn.exec_driver_sql("SELECT indexname FROM pg_indexes")}
+
+
+def _normalize_sqlite_timestamps(conn) -> None:
+    """Give rows stamped by the old CURRENT_TIMESTAMP default ('YYYY-MM-DD HH:MM:SS') microseconds.
+
+    SQLite compares DATETIME columns as text, so keyset cursors only order
+    correctly when every row uses SQLAlchemy's 'YYYY-MM-DD HH:MM:SS.ffffff'.
+    """
+    for table in Base.metadata.sorted_tables:
+        for col in table.columns:
+            if isinstance(col.type, DateTime):
+                conn.exec_driver_sql(
+                    f'UPDATE "{table.name}" SET "{col.name}" = "{col.name}" || \'.000000\' '
+                    f'WHERE length("{col.name}") = 19'
+                )
+
+
+def create_all(attempts: int = 3) -> None:
+    """Create tables and any indexes declared since they were created (idempotent).
+
+    Workers start together and race on the DDL; a worker that loses (duplicate
+    index, locked database) re-checks and carries on once everything exists.
+    """
+    if not _engine:
+        return
+    wanted = {ix.name for table in Base.metadata.sorted_tables for ix in table.indexes}
+    for attempt in range(1, attempts + 1):
+        try:
+            Base.metadata.create_all(_engine)
+            # create_all skips existing tables; add indexes declared since they were created
+            with _engine.begin() as conn:
+                for table in Base.metadata.sorted_tables:
+                    for ix in table.indexes:
+                        conn.execute(CreateIndex(ix, if_not_exists=True))
+                if IS_SQLITE:
+                    _normalize_sqlite_timestamps(conn)
+            return
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            print(f"[db] create_all attempt {attempt} failed ({e}); retrying")
+            if not IS_SQLITE:  # why: SQLite serializes DDL, so a loser only sees "locked" and retries
+                try:
+                    with _engine.connect() as conn:
+                        if wanted <= _pg_index_names(conn):
+                            return  # another worker created them concurrently
+                except Exception:
+                    pass
+            time.sleep(0.2 * attempt)
 
 
 def can_connect() -> bool:
@@ -83,6 +206,7 @@ def get_db_info() -> dict:
             "enabled": True,
             "dialect": _engine.url.get_backend_name(),
             "driver": _engine.url.get_driver_name(),
+            "async_driver": _async_engine.url.get_driver_name() if _async_engine else None,
             "server_version": ver,
         }
     except Exception as e:
@@ -0,0 +1,268 @@
+# backend/app/http_pool.py
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpcore
+import httpx
+from dotenv import load_dotenv
+from prometheus_client import Gauge
+
+from app.timing import current_provider, UPSTREAM_REQUEST_SECONDS, UPSTREAM_BYTES
+
+# Load env so the pool sees HTTP_* knobs regardless of import order
+load_dotenv(Path(__file__).resolve().parents[1] / ".env")   # backend/.env
+load_dotenv(Path(__file__).resolve().parent / ".env")       # backend/app/.env (optional)
+
+USER_AGENT = "FinNewsSummarizer/1.0"
+
+# Pool knobs (one pool per gunicorn worker)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))          # 0 = unlimited
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_HTTP2 = os.getenv("HTTP_HTTP2", "0") == "1"
+HTTP_DNS_CACHE_TTL = float(os.getenv("HTTP_DNS_CACHE_TTL", "300"))      # 0 = disabled
+
+HTTP_POOL_CONNECTIONS = Gauge("http_pool_connections", "Upstream HTTP pool connections", ["state"])
+HTTP_POOL_HOST_WAITING = Gauge("http_pool_host_waiting", "Requests waiting for a per-host connection slot")
+HTTP_POOL_HOST_INFLIGHT = Gauge("http_pool_host_inflight", "Requests holding a per-host connection slot")
+
+
+class _CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Resolve each upstream host once per TTL instead of once per new connection.
+
+    TLS still verifies against the original hostname: httpcore passes the origin
+    host as server_hostname to start_tls, independent of the address we dial.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._inner = httpcore.AnyIOBackend()
+        self._ttl = ttl
+        self._cache: dict[tuple[str, int], tuple[float, str]] = {}
+
+    async def _resolve(self, host: str, port: int) -> str:
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        hit = self._cache.get((host, port))
+        if hit and hit[0] > now:
+            return hit[1]
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return host  # why: let the real connect surface the resolution error
+        if not infos:
+            return host
+        addr = infos[0][4][0]
+        self._cache[(host, port)] = (now + self._ttl, addr)
+        return addr
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addr = await self._resolve(host, port)
+        try:
+            return await self._inner.connect_tcp(
+                addr, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+            )
+        except (httpcore.ConnectError, httpcore.ConnectTimeout):
+            self._cache.pop((host, port), None)  # why: cached address may have gone stale
+            raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees the per-host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _InstrumentedStream(httpx.AsyncByteStream):
+    """Counts body bytes and reports latency once the body has been read and closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self.nbytes = 0
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self.nbytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close(self.nbytes)
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Per-host upstream latency + bytes, labelled with the provider of the current search."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        provider = current_provider.get()
+        host = request.url.host or "unknown"
+        started = time.perf_counter()
+        try:
+            resp = await self._inner.handle_async_request(request)
+        except BaseException:
+            UPSTREAM_REQUEST_SECONDS.labels(provider, host, "error").observe(time.perf_counter() - started)
+            raise
+
+        status = str(resp.status_code)
+        done = False
+
+        def on_close(nbytes: int) -> None:
+            nonlocal done
+            if not done:
+                done = True
+                UPSTREAM_REQUEST_SECONDS.labels(provider, host, status).observe(time.perf_counter() - started)
+                UPSTREAM_BYTES.labels(provider, host).inc(nbytes)
+
+        resp.stream = _InstrumentedStream(resp.stream, on_close)  # type: ignore[arg-type]
+        return resp
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per upstream host on top of the global pool limit."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, per_host: int) -> None:
+        self._inner = inner
+        self._per_host = per_host
+        self._sems: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._per_host <= 0:
+            return await self._inner.handle_async_request(request)
+
+        host = request.url.host
+        sem = self._sems.get(host)
+        if sem is None:
+            sem = self._sems[host] = asyncio.Semaphore(self._per_host)
+
+        HTTP_POOL_HOST_WAITING.inc()
+        try:
+            await sem.acquire()
+        finally:
+            HTTP_POOL_HOST_WAITING.dec()
+        HTTP_POOL_HOST_INFLIGHT.inc()
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                HTTP_POOL_HOST_INFLIGHT.dec()
+                sem.release()
+
+        try:
+            resp = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        resp.stream = _ReleasingStream(resp.stream, release)  # type: ignore[arg-type]
+        return resp
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+_client: Optional[httpx.AsyncClient] = None
+_pool: Optional[httpcore.AsyncConnectionPool] = None
+
+
+def _count_connections(idle: bool) -> int:
+    if _pool is None:
+        return 0
+    return sum(1 for c in _pool.connections if c.is_idle() == idle and not c.is_closed())
+
+
+HTTP_POOL_CONNECTIONS.labels("idle").set_function(lambda: _count_connections(True))
+HTTP_POOL_CONNECTIONS.labels("active").set_function(lambda: _count_connections(False))
+
+
+def _build_client() -> httpx.AsyncClient:
+    global _pool
+    http2 = HTTP_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except Exception:
+            print("[http] HTTP_HTTP2=1 but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    inner = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+    # httpx doesn't expose the httpcore pool; reach in for DNS caching + gauges.
+    _pool = getattr(inner, "_pool", None)
+    if _pool is not None and HTTP_DNS_CACHE_TTL > 0:
+        _pool._network_backend = _CachingDNSBackend(HTTP_DNS_CACHE_TTL)
+
+    return httpx.AsyncClient(
+        # Per-host slot wait is excluded from the upstream latency histogram
+        transport=_PerHostLimitTransport(_InstrumentedTransport(inner), HTTP_MAX_PER_HOST),
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+async def start() -> None:
+    """Create the per-worker shared client (call from app startup)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+
+
+async def close() -> None:
+    """Close the shared client and drop pooled connections (call from app shutdown)."""
+    global _client, _pool
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _pool = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared pooled client, creating it lazily outside the app (scripts)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
@@ -0,0 +1,184 @@
+# backend/app/kafka_events.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+KAFKA_PRODUCED = Counter("kafka_messages_produced_total", "Kafka messages produced", ["topic"])
+
+# outcome: queued | sent | failed | dropped (queue full, oldest evicted or block timed out)
+KAFKA_EVENTS = Counter("kafka_events_total", "Search events through the producer queue", ["outcome"])
+KAFKA_QUEUE_DEPTH = Gauge("kafka_event_queue_depth", "Search events waiting for the Kafka sender")
+
+POLICIES = ("drop_oldest", "block")
+
+KAFKA_CONSUME_BATCH = Histogram(
+    "kafka_consume_batch_size",
+    "Records per consumer getmany() batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+KAFKA_CONSUME_RATE = Gauge("kafka_consume_messages_per_second", "Consumer throughput (EWMA over recent batches)")
+
+
+class EventPublisher:
+    """Bounded per-worker event queue drained by a single background sender.
+
+    Request handlers call publish(); the sender hands events to the producer,
+    whose linger/batch/compression settings group them into few requests.
+    Delivery is counted when the broker acks, not when the event is queued.
+
+    When the queue is full, "drop_oldest" evicts the oldest event so publish
+    never waits; "block" waits up to block_timeout for room, then drops the
+    new event. Events queued while Kafka is unreachable wait for the producer.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        maxsize: int = 10000,
+        policy: str = "drop_oldest",
+        block_timeout: float = 0.05,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self.topic = topic
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue: asyncio.Queue[tuple[bytes, Optional[bytes]]] = asyncio.Queue(maxsize=max(1, maxsize))
+        KAFKA_QUEUE_DEPTH.set_function(self._queue.qsize)
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    async def publish(self, value: bytes, key: Optional[bytes] = None) -> bool:
+        """Queue one event; False if it was dropped."""
+        item = (value, key)
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.policy == "drop_oldest":
+                self._queue.get_nowait()
+                KAFKA_EVENTS.labels("dropped").inc()
+                self._queue.put_nowait(item)
+            else:
+                try:
+                    await asyncio.wait_for(self._queue.put(item), timeout=self.block_timeout)
+                except asyncio.TimeoutError:
+                    KAFKA_EVENTS.labels("dropped").inc()
+                    return False
+        KAFKA_EVENTS.labels("queued").inc()
+        return True
+
+    def _on_delivery(self, fut: asyncio.Future) -> None:
+        if fut.cancelled() or fut.exception() is not None:
+            KAFKA_EVENTS.labels("failed").inc()
+        else:
+            KAFKA_EVENTS.labels("sent").inc()
+            KAFKA_PRODUCED.labels(self.topic).inc()
+
+    async def _send(self, producer: Any, value: bytes, key: Optional[bytes]) -> None:
+        try:
+            # Returns once the event is in the producer's batch; awaits when that buffer is full
+            fut = await producer.send(self.topic, value, key=key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            KAFKA_EVENTS.labels("failed").inc()
+            print(f"[kafka] send failed: {e}")
+            return
+        fut.add_done_callback(self._on_delivery)
+
+    async def run(self, get_producer: Callable[[], Any], retry_interval: float = 0.5) -> None:
+        """Sender loop; cancel to stop. get_producer() returns None until the producer is up."""
+        while True:
+            value, key = await self._queue.get()
+            producer = get_producer()
+            while producer is None:
+                await asyncio.sleep(retry_interval)
+                producer = get_producer()
+            await self._send(producer, value, key)
+
+    async def drain(self, producer: Any, timeout: float = 5.0) -> None:
+        """Hand queued events to the producer and flush it (call on shutdown)."""
+        async def _flush() -> None:
+            while not self._queue.empty():
+                value, key = self._queue.get_nowait()
+                await self._send(producer, value, key)
+            await producer.flush()
+
+        try:
+            await asyncio.wait_for(_flush(), timeout=timeout)
+        except Exception as e:
+            print(f"[kafka] drain incomplete ({len(self)} events left): {e!r}")
+
+
+def decode_record(msg: Any) -> dict[str, Any]:
+    """Ring entry for one consumed record (JSON value decoded when possible)."""
+    decoded = (msg.value or b"").decode("utf-8", errors="ignore")
+    try:
+        value: Any = json.loads(decoded)
+    except Exception:
+        value = decoded
+    return {
+        "topic": msg.topic,
+        "offset": msg.offset,
+        "timestamp": msg.timestamp,  # ms since epoch
+        "ts_iso": dt.datetime.fromtimestamp(msg.timestamp / 1000.0, tz=dt.timezone.utc).isoformat(),
+        "key": (msg.key.decode("utf-8", "replace") if msg.key else None),
+        "value": value,
+    }
+
+
+async def push_ring(redis, key: str, events: Iterable[dict[str, Any]], max_len: int) -> None:
+    """Prepend a batch to the shared Redis ring and trim it, in one MULTI/EXEC round trip."""
+    rows = [json.dumps(e) for e in events]
+    if not rows:
+        return
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.lpush(key, *rows)
+        pipe.ltrim(key, 0, max_len - 1)
+        await pipe.execute()
+
+
+class ConsumeStats:
+    """Throughput gauge (EWMA msgs/sec) and 1-in-N sampled JSON log lines."""
+
+    def __init__(self, sample_every: int = 100, alpha: float = 0.2) -> None:
+        self.sample_every = max(0, sample_every)
+        self.alpha = alpha
+        self._seen = 0
+        self._rate = 0.0
+        self._last = time.monotonic()
+
+    def observe(self, events: list[dict[str, Any]]) -> None:
+        now = time.monotonic()
+        elapsed = max(now - self._last, 1e-3)
+        self._last = now
+        KAFKA_CONSUME_BATCH.observe(len(events))
+        self._rate = len(events) / elapsed if not self._rate else \
+            (1 - self.alpha) * self._rate + self.alpha * len(events) / elapsed
+        KAFKA_CONSUME_RATE.set(self._rate)
+
+        if not self.sample_every:
+            return
+        for e in events:
+            self._seen += 1
+            if self._seen % self.sample_every:
+                continue
+            v = e["value"]
+            print(json.dumps({
+                "event": "kafka_consume",
+                "topic": e["topic"],
+                "offset": e["offset"],
+                "ts": e["ts_iso"],
+                "query": v.get("query") if isinstance(v, dict) else None,
+                "count": v.get("count") if isinstance(v, dict) else None,
+                "batch": len(events),
+                "rate": round(self._rate, 1),
+                "seen": self._seen,
+            }))
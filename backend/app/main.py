@@ -1,33 +1,42 @@
 # backend/app/main.py
 from __future__ import annotations
-import os, re, datetime as dt
+import os, re, time, datetime as dt
 from pathlib import Path
-from typing import Literal, Optional, Tuple
+from typing import AsyncIterator, Literal, Optional, Tuple
 
-import httpx
 import asyncio, json
-from textwrap import shorten
 from collections import deque
 from prometheus_fastapi_instrumentator import Instrumentator
 from prometheus_client import Counter
 import redis.asyncio as aioredis
-from fastapi import FastAPI, Query, HTTPException, Request, Response
+from fastapi import Depends, FastAPI, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_jsonable_python
 from dotenv import load_dotenv
 
-# Rate limiting
-from slowapi import Limiter
 from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from limits import parse as parse_limit
 
-from app.models import SearchResponse, Article
-from app.services.summarizer import summarize
-from app.services.sentiment import quick_sentiment
-from app.providers.rss import RSSProvider
+from app.models import SearchResponse, SavedSearchResult, SavedRunRequest, SavedRunResponse
+from app.models import article_fields, search_response_json
+from app.models import SearchBatchRequest, SearchBatchResponse
+from app.services.analysis import summarize_articles
+from app.services.sentiment import sentiment_from_tokens_batch
+from app.timing import stage, current_provider, collect_server_timing, merge_server_timing, server_timing_header, ARTICLES_PROCESSED
+from app.providers.rss import RSSProvider, FeedCache
 from app.providers.newsapi import NewsAPIProvider
+from app.providers.local import LocalProvider
+from app.services.article_index import ArticleIndex
 from app.db import can_connect, get_db_info
+from app import http_pool
+from app.singleflight import SingleFlight
+from app.kafka_events import EventPublisher, ConsumeStats, decode_record, push_ring, KAFKA_PRODUCED
+from app.search_cache import SearchCache, SEARCH_CACHE_REQUESTS, make_key as make_cache_key
+from app.search_batch import SharedFetch, enrich_many
+from app.quota import QuotaGovernor, quota_priority
+from app.rate_limit import RateLimiter
+from app.middleware import BodySizeLimitMiddleware, ClientIPMiddleware, SecurityHeadersMiddleware, resolve_client_ip
 
 # ---------- Env ----------
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
@@ -35,19 +44,53 @@ load_dotenv(Path(__file__).resolve().parent / ".env")
 
 ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "http://localhost:5173").split(",") if o.strip()]
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "").strip()
+NEWSAPI_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "").strip() or None  # e.g. a local fake upstream
+# Query passes: sequential (one at a time), parallel (speculative, first hit in priority order wins)
+# or auto (parallel while the shared quota has >= NEWSAPI_PARALLEL_MIN_BUDGET requests left)
+NEWSAPI_PASS_MODE = os.getenv("NEWSAPI_PASS_MODE", "sequential").strip() or "sequential"
+NEWSAPI_PARALLEL_MIN_BUDGET = int(os.getenv("NEWSAPI_PARALLEL_MIN_BUDGET", "50") or 0)
+# Cluster-wide NewsAPI quota (Redis token bucket); 429 backoff applies even with no quota set
+NEWSAPI_DAILY_QUOTA = int(os.getenv("NEWSAPI_DAILY_QUOTA", "0") or 0)   # 0 = unknown / unlimited
+NEWSAPI_QUOTA_BURST = int(os.getenv("NEWSAPI_QUOTA_BURST", "0") or 0)   # bucket size; 0 = the daily quota
+NEWSAPI_QUOTA_RESERVE = float(os.getenv("NEWSAPI_QUOTA_RESERVE", "0.2") or 0)  # share background work can't touch
+NEWSAPI_QUOTA_WAIT_S = float(os.getenv("NEWSAPI_QUOTA_WAIT_S", "2") or 0)     # interactive wait for a refill
+NEWSAPI_BACKOFF_S = float(os.getenv("NEWSAPI_BACKOFF_S", "60") or 60)          # 429 without Retry-After
+
+# RSS feed templates ("{q}" = query); empty = provider defaults
+RSS_FEEDS = [f.strip() for f in os.getenv("RSS_FEEDS", "").split(",") if f.strip()]
+RSS_FEED_TIMEOUT = float(os.getenv("RSS_FEED_TIMEOUT", "10") or 10)
+RSS_FEED_CACHE_SIZE = int(os.getenv("RSS_FEED_CACHE_SIZE", "256") or 0)  # 0 disables conditional GET
 
 # Hardening knobs
 RATE_LIMIT = os.getenv("RATE_LIMIT", "60/minute").strip()
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"  # 0 only for local load tests
+# Requests a worker may admit without a Redis round trip while a client is well under its limit (logged in Redis afterwards)
+RATE_LIMIT_LOCAL_LEASE = int(os.getenv("RATE_LIMIT_LOCAL_LEASE", "4") or 0)
+RATE_LIMIT_LOCAL_TTL_MS = float(os.getenv("RATE_LIMIT_LOCAL_TTL_MS", "250") or 0)
 SECURITY_HEADERS_ENABLED = os.getenv("SECURITY_HEADERS", "0") == "1"
 MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", "0") or 0)
+# POST /api/search/batch: own quota, charged per distinct query rather than per request
+SEARCH_BATCH_RATE = os.getenv("SEARCH_BATCH_RATE", "600/minute").strip()
+SEARCH_BATCH_MAX = int(os.getenv("SEARCH_BATCH_MAX", "200") or 200)
+SEARCH_BATCH_CONCURRENCY = int(os.getenv("SEARCH_BATCH_CONCURRENCY", "16") or 16)
+
+# Per-stage Server-Timing header on /api/search (stage histograms are always on)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "0") == "1"
 
 ENABLE_KAFKA = os.getenv("ENABLE_KAFKA", "0") == "1"
 KAFKA_BOOTSTRAP = os.getenv("KAFKA_BOOTSTRAP", "kafka:9092")
 KAFKA_TOPIC = os.getenv("KAFKA_TOPIC", "searches")
+# Producer batching: events wait up to LINGER_MS to share a compressed batch
+KAFKA_LINGER_MS = int(os.getenv("KAFKA_LINGER_MS", "20") or 0)
+KAFKA_BATCH_BYTES = int(os.getenv("KAFKA_BATCH_BYTES", "65536") or 16384)
+KAFKA_COMPRESSION = (os.getenv("KAFKA_COMPRESSION", "gzip") or "none").lower()   # gzip | snappy | lz4 | zstd | none
+# Bounded per-worker event queue in front of the producer
+KAFKA_QUEUE_SIZE = int(os.getenv("KAFKA_QUEUE_SIZE", "10000") or 10000)
+KAFKA_QUEUE_POLICY = os.getenv("KAFKA_QUEUE_POLICY", "drop_oldest")               # drop_oldest | block
+KAFKA_QUEUE_BLOCK_MS = float(os.getenv("KAFKA_QUEUE_BLOCK_MS", "50") or 0)
 
 # ---------- Helpers ----------
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-IP_RE = re.compile(r"\s*([^,\s]+)\s*")
 
 def _clean_date(s: Optional[str]) -> Optional[str]:
     if not s:
@@ -55,39 +98,56 @@ def _clean_date(s: Optional[str]) -> Optional[str]:
     s = s.strip()
     return s if DATE_RE.match(s) else None
 
-def _pick_client_ip(request: Request) -> Tuple[str, dict]:
-    headers = {k.lower(): v for k, v in request.headers.items()}
-
-    cf_ip = headers.get("cf-connecting-ip")
-    if cf_ip:
-        return cf_ip.strip(), {"source": "cf-connecting-ip", "xff": headers.get("x-forwarded-for"), "xreal": headers.get("x-real-ip")}
-
-    xff = headers.get("x-forwarded-for")
-    if xff:
-        m = IP_RE.match(xff)  # left-most entry
-        if m:
-            ip = m.group(1)
-            return ip, {"source": "x-forwarded-for", "xff": xff, "xreal": headers.get("x-real-ip")}
-
-    xreal = headers.get("x-real-ip")
-    if xreal:
-        return xreal.strip(), {"source": "x-real-ip", "xff": headers.get("x-forwarded-for"), "xreal": xreal}
+def _client_ip(request: Request) -> str:
+    """Client IP resolved once per request by ClientIPMiddleware (resolved here if it didn't run)."""
+    scope = request.scope
+    if "client_ip" not in scope:
+        scope["client_ip"], scope["client_ip_source"] = resolve_client_ip(scope)
+    return scope["client_ip"]
 
-    peer = get_remote_address(request)
-    return peer or "0.0.0.0", {"source": "peer", "xff": headers.get("x-forwarded-for"), "xreal": headers.get("x-real-ip")}
+def _pick_client_ip(request: Request) -> Tuple[str, dict]:
+    ip = _client_ip(request)
+    return ip, {
+        "source": request.scope["client_ip_source"],
+        "xff": request.headers.get("x-forwarded-for"),
+        "xreal": request.headers.get("x-real-ip"),
+    }
 
 def key_by_api_key_or_ip(request: Request) -> str:
     api_key = request.headers.get("x-api-key")
     if api_key:
         return api_key.strip()
-    ip, _ctx = _pick_client_ip(request)
-    return ip
+    return _client_ip(request)
+
+# Per-worker ETag/Last-Modified cache shared by every RSSProvider instance
+rss_feed_cache = FeedCache(RSS_FEED_CACHE_SIZE) if RSS_FEED_CACHE_SIZE > 0 else None
+
+# Local BM25 index of every article the upstream providers return (provider=local)
+LOCAL_INDEX_MAX_DOCS = int(os.getenv("LOCAL_INDEX_MAX_DOCS", "20000") or 20000)
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "/tmp/finnews/local_index.json.gz").strip()  # empty = memory only
+LOCAL_INDEX_SYNC_S = float(os.getenv("LOCAL_INDEX_SYNC_S", "60") or 60)
+article_index = ArticleIndex(LOCAL_INDEX_MAX_DOCS, LOCAL_INDEX_PATH)
+
+# ---------- Redis (rate limits, diag, shared ring) ----------
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
 
-# SlowAPI limiter
-limiter = Limiter(key_func=key_by_api_key_or_ip, default_limits=[RATE_LIMIT])
+# Sliding-window limits shared by all workers; RATE_LIMIT applies to routes without their own limit()
+limiter = RateLimiter(
+    redis_client,
+    key_by_api_key_or_ip,
+    default=RATE_LIMIT,
+    enabled=RATE_LIMIT_ENABLED,
+    local_lease=RATE_LIMIT_LOCAL_LEASE,
+    local_ttl=RATE_LIMIT_LOCAL_TTL_MS / 1000.0,
+)
 
 # ---------- App ----------
-app = FastAPI(title="Financial News Summarizer", version="0.6.1")
+app = FastAPI(
+    title="Financial News Summarizer",
+    version="0.6.1",
+    dependencies=[Depends(limiter.default_limit)],
+)
 
 # Prometheus
 Instrumentator().instrument(app).expose(
@@ -98,19 +158,87 @@ Instrumentator().instrument(app).expose(
 )
 
 # Custom Kafka counters
-KAFKA_PRODUCED = Counter("kafka_messages_produced_total", "Kafka messages produced", ["topic"])
 KAFKA_CONSUMED = Counter("kafka_messages_consumed_total", "Kafka messages consumed", ["topic"])
 
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
-
-# ---------- Redis (diag + shared ring) ----------
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
-redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+# ---------- Kafka ring (Redis) ----------
 KAFKA_RING_KEY = os.getenv("KAFKA_RING_KEY", "kafka_recent")
 KAFKA_RING_MAX = int(os.getenv("KAFKA_MEMORY_LOG", "200"))  # also used for Redis ring length
+KAFKA_CONSUME_BATCH_SIZE = int(os.getenv("KAFKA_CONSUME_BATCH_SIZE", "500") or 500)
+KAFKA_CONSUME_TIMEOUT_MS = int(os.getenv("KAFKA_CONSUME_TIMEOUT_MS", "1000") or 1000)
+KAFKA_LOG_SAMPLE = int(os.getenv("KAFKA_LOG_SAMPLE", "100") or 0)   # log 1 in N consumed events; 0 = off
+
+# ---------- /api/search response cache (Redis) ----------
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "60") or 0)   # 0 disables the cache
+SEARCH_CACHE_SWR = int(os.getenv("SEARCH_CACHE_SWR", "300") or 0)  # serve-stale window after TTL
+search_cache = SearchCache(redis_client, SEARCH_CACHE_TTL, SEARCH_CACHE_SWR)
+
+# ---------- Single-flight (identical upstream fetches, in-worker + cross-worker) ----------
+SINGLEFLIGHT_LEASE_MS = int(os.getenv("SINGLEFLIGHT_LEASE_MS", "15000") or 0)  # 0 = in-worker only
+SINGLEFLIGHT_WAIT_S = float(os.getenv("SINGLEFLIGHT_WAIT_S", "15") or 15)
+singleflight = SingleFlight(redis_client, lease_ms=SINGLEFLIGHT_LEASE_MS, wait_timeout=SINGLEFLIGHT_WAIT_S)
+
+# ---------- NewsAPI quota governor (shared by all workers) ----------
+newsapi_governor = QuotaGovernor(
+    redis_client, "newsapi",
+    per_day=NEWSAPI_DAILY_QUOTA,
+    capacity=NEWSAPI_QUOTA_BURST,
+    reserve=NEWSAPI_QUOTA_RESERVE,
+    max_wait=NEWSAPI_QUOTA_WAIT_S,
+    default_backoff=NEWSAPI_BACKOFF_S,
+)
+
+def _newsapi_provider() -> NewsAPIProvider:
+    return NewsAPIProvider(
+        NEWSAPI_KEY, NEWSAPI_BASE_URL,
+        pass_mode=NEWSAPI_PASS_MODE,  # type: ignore[arg-type]
+        governor=newsapi_governor,
+        parallel_min_budget=NEWSAPI_PARALLEL_MIN_BUDGET,
+    )
+
+# ---------- Shared upstream HTTP pool (one per worker) ----------
+@app.on_event("startup")
+async def _http_pool_start():
+    await http_pool.start()
+
+@app.on_event("shutdown")
+async def _http_pool_stop():
+    await http_pool.close()
+
+# ---------- Local article index persistence ----------
+@app.on_event("startup")
+async def _local_index_start():
+    async def _sync_forever():
+        while True:
+            await asyncio.sleep(LOCAL_INDEX_SYNC_S)
+            try:
+                await article_index.sync()
+            except Exception as e:
+                print(f"[index] sync failed: {e}")
+
+    try:
+        await article_index.sync()  # load what previous runs / other workers saved
+    except Exception as e:
+        print(f"[index] initial load failed: {e}")
+    app.state.local_index_task = asyncio.create_task(_sync_forever())
+
+@app.on_event("shutdown")
+async def _local_index_stop():
+    task = getattr(app.state, "local_index_task", None)
+    if task:
+        task.cancel()
+    try:
+        await article_index.sync()
+    except Exception as e:
+        print(f"[index] final sync failed: {e}")
 
 # ---------- Kafka (optional) ----------
+kafka_events = EventPublisher(
+    KAFKA_TOPIC,
+    maxsize=KAFKA_QUEUE_SIZE,
+    policy=KAFKA_QUEUE_POLICY,
+    block_timeout=KAFKA_QUEUE_BLOCK_MS / 1000.0,
+)
+
 if ENABLE_KAFKA:
     try:
         from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
@@ -136,8 +264,12 @@ if ENABLE_KAFKA:
                         loop=loop,
                         bootstrap_servers=KAFKA_BOOTSTRAP,
                         client_id=f"finnews-api-{os.getpid()}",
+                        linger_ms=KAFKA_LINGER_MS,
+                        max_batch_size=KAFKA_BATCH_BYTES,
+                        compression_type=None if KAFKA_COMPRESSION == "none" else KAFKA_COMPRESSION,
                     )
                     await app.state.kafka_producer.start()
+                    app.state.kafka_producer_ready = True
                     print("[kafka] producer started")
                     # Wait forever; cancelled on shutdown
                     await asyncio.Event().wait()
@@ -147,6 +279,7 @@ if ENABLE_KAFKA:
                     print(f"[kafka] producer error: {e}; retrying in 2s")
                     await asyncio.sleep(2)
                 finally:
+                    app.state.kafka_producer_ready = False
                     try:
                         prod = getattr(app.state, "kafka_producer", None)
                         if prod:
@@ -167,46 +300,24 @@ if ENABLE_KAFKA:
                 try:
                     await consumer.start()
                     print("[kafka] consumer started")
-                    async for msg in consumer:
-                        KAFKA_CONSUMED.labels(msg.topic).inc()
-
-                        raw = msg.value or b""
-                        decoded = raw.decode("utf-8", errors="ignore")
-                        try:
-                            parsed = json.loads(decoded)
-                        except Exception:
-                            parsed = decoded
-
-                        ts_iso = dt.datetime.fromtimestamp(msg.timestamp / 1000.0, tz=dt.timezone.utc).isoformat()
-
-                        details = ""
-                        if isinstance(parsed, dict):
-                            if "query" in parsed and "count" in parsed:
-                                details = f" query={parsed.get('query')} count={parsed.get('count')}"
-                            elif "data" in parsed:
-                                details = f" data={shorten(str(parsed.get('data')), width=80, placeholder='…')}"
-
-                        print(
-                            f"[kafka] consume topic={msg.topic} off={msg.offset} at={ts_iso}"
-                            f"{details} :: {shorten(str(parsed), width=120, placeholder='…')}"
+                    stats = ConsumeStats(KAFKA_LOG_SAMPLE)
+                    while True:
+                        batches = await consumer.getmany(
+                            timeout_ms=KAFKA_CONSUME_TIMEOUT_MS, max_records=KAFKA_CONSUME_BATCH_SIZE,
                         )
-
-                        event = {
-                            "topic": msg.topic,
-                            "offset": msg.offset,
-                            "timestamp": msg.timestamp,  # ms since epoch
-                            "ts_iso": ts_iso,
-                            "key": (msg.key.decode("utf-8", "replace") if msg.key else None),
-                            "value": parsed,
-                        }
+                        events = [decode_record(msg) for records in batches.values() for msg in records]
+                        if not events:
+                            continue
+                        for tp, records in batches.items():
+                            KAFKA_CONSUMED.labels(tp.topic).inc(len(records))
+                        stats.observe(events)
 
                         # In-memory per-worker ring
-                        app.state.kafka_last.append(event)
+                        app.state.kafka_last.extend(events)
 
-                        # Mirror to Redis (shared across workers)
+                        # Mirror to Redis (shared across workers), newest first, one round trip per batch
                         try:
-                            await redis_client.lpush(KAFKA_RING_KEY, json.dumps(event))
-                            await redis_client.ltrim(KAFKA_RING_KEY, 0, KAFKA_RING_MAX - 1)
+                            await push_ring(redis_client, KAFKA_RING_KEY, events, KAFKA_RING_MAX)
                         except Exception as e:
                             print(f"[kafka] redis ring push failed: {e}")
 
@@ -224,9 +335,18 @@ if ENABLE_KAFKA:
 
         app.state.kafka_prod_task = asyncio.create_task(_start_producer_forever())
         app.state.kafka_cons_task = asyncio.create_task(_consume_forever())
+        app.state.kafka_send_task = asyncio.create_task(kafka_events.run(
+            lambda: app.state.kafka_producer if getattr(app.state, "kafka_producer_ready", False) else None
+        ))
 
     @app.on_event("shutdown")
     async def _kafka_stop():
+        send_task = getattr(app.state, "kafka_send_task", None)
+        if send_task:
+            send_task.cancel()
+        # Flush queued search events before the producer task stops the producer
+        if getattr(app.state, "kafka_producer_ready", False):
+            await kafka_events.drain(app.state.kafka_producer)
         for attr in ("kafka_cons_task", "kafka_prod_task"):
             task = getattr(app.state, attr, None)
             if task:
@@ -239,22 +359,6 @@ if ENABLE_KAFKA:
                 pass
         print("[kafka] shutdown complete")
 
-# ---------- 429 handler ----------
-@app.exception_handler(RateLimitExceeded)
-async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    retry_after = getattr(exc, "retry_after", None)
-    if retry_after is None:
-        reset_in = getattr(exc, "reset_in", None)
-        try:
-            retry_after = int(reset_in) if reset_in is not None else 60
-        except Exception:
-            retry_after = 60
-    return JSONResponse(
-        status_code=429,
-        content={"detail": "Too Many Requests"},
-        headers={"Retry-After": str(retry_after), "X-RateLimit-Remaining": "0"},
-    )
-
 # ---------- CORS ----------
 app.add_middleware(
     CORSMiddleware,
@@ -266,30 +370,14 @@ app.add_middleware(
 
 # ---------- Security headers ----------
 if SECURITY_HEADERS_ENABLED:
-    @app.middleware("http")
-    async def security_headers_mw(request: Request, call_next):
-        resp = await call_next(request)
-        resp.headers["X-Content-Type-Options"] = "nosniff"
-        resp.headers["X-Frame-Options"] = "DENY"
-        resp.headers["Referrer-Policy"] = "no-referrer"
-        resp.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        resp.headers.setdefault(
-            "Content-Security-Policy",
-            "default-src 'self' http://localhost:5173 data: blob:; "
-            "img-src * data: blob:; connect-src *; "
-            "style-src 'self' 'unsafe-inline' http://localhost:5173; "
-            "script-src 'self' 'unsafe-inline'"
-        )
-        return resp
+    app.add_middleware(SecurityHeadersMiddleware)
 
 # ---------- Max body size ----------
 if MAX_BODY_BYTES > 0:
-    @app.middleware("http")
-    async def body_size_limit_mw(request: Request, call_next):
-        cl = request.headers.get("content-length")
-        if cl and cl.isdigit() and int(cl) > MAX_BODY_BYTES:
-            return Response(status_code=413, content="Payload Too Large")
-        return await call_next(request)
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=MAX_BODY_BYTES)
+
+# ---------- Client IP (outermost: resolved once, read by the rate limiter and handlers) ----------
+app.add_middleware(ClientIPMiddleware)
 
 # ---------- Routers (optional DB) ----------
 DB_OK = can_connect()
@@ -297,9 +385,175 @@ if DB_OK:
     from app.routers.saved_searches import router as saved_router
     app.include_router(saved_router)
 
+# ---------- Saved-search background refresh (leader-elected) ----------
+SAVED_REFRESH_ENABLED = os.getenv("SAVED_REFRESH_ENABLED", "1") == "1"
+SAVED_REFRESH_INTERVAL = float(os.getenv("SAVED_REFRESH_INTERVAL", "300") or 300)
+SAVED_REFRESH_CONCURRENCY = int(os.getenv("SAVED_REFRESH_CONCURRENCY", "4") or 4)
+SAVED_REFRESH_JITTER = float(os.getenv("SAVED_REFRESH_JITTER", "60") or 0)
+# POST /api/saved/run: distinct searches run at once, and max saved searches per call
+SAVED_RUN_CONCURRENCY = int(os.getenv("SAVED_RUN_CONCURRENCY", "8") or 8)
+SAVED_RUN_MAX = int(os.getenv("SAVED_RUN_MAX", "200") or 200)
+
+if DB_OK:
+    from app.saved_refresh import SavedSearchRefresher, load_saved_params, load_saved_many
+
+    saved_refresher = SavedSearchRefresher(
+        redis_client,
+        lambda params: _run_saved_params(params),  # why: defined with the search helpers below
+        interval=SAVED_REFRESH_INTERVAL,
+        concurrency=SAVED_REFRESH_CONCURRENCY,
+        jitter=SAVED_REFRESH_JITTER,
+    )
+    app.state.saved_refresher = saved_refresher  # why: the saved-search router drops results on delete
+
+    if SAVED_REFRESH_ENABLED:
+        @app.on_event("startup")
+        async def _saved_refresh_start():
+            async def _run() -> None:
+                quota_priority.set("background")  # why: refreshes yield the reserved NewsAPI budget to users
+                await saved_refresher.run_forever()
+
+            app.state.saved_refresh_task = asyncio.create_task(_run())
+
+        @app.on_event("shutdown")
+        async def _saved_refresh_stop():
+            task = getattr(app.state, "saved_refresh_task", None)
+            if task:
+                task.cancel()
+
+    @app.get("/api/saved/{saved_id}/result", response_model=SavedSearchResult, tags=["saved-searches"])
+    async def saved_result(saved_id: int):
+        """Pre-computed result for a saved search; computed on demand if the refresher hasn't run yet."""
+        params, stored = await asyncio.gather(
+            asyncio.to_thread(load_saved_params, saved_id), saved_refresher.get_result(saved_id),
+        )
+        if params is None:
+            if stored:
+                await saved_refresher.forget_result(saved_id)  # why: stored by a refresh still running at delete time
+            raise HTTPException(404, "Not found")
+        if stored:
+            body, refreshed_at = stored["body"], stored["refreshed_at"]
+        else:
+            got = await _run_saved_params(params)
+            if got is None:
+                raise HTTPException(422, "Saved search params are not a valid search")
+            body = got[0]
+            refreshed_at = await saved_refresher.store_result(saved_id, body)
+        # why: splice the stored JSON instead of re-validating it through SearchResponse
+        content = f'{{"saved_id":{saved_id},"refreshed_at":{json.dumps(refreshed_at)},"result":{body}}}'
+        return Response(content=content, media_type="application/json")
+
+    def _saved_run_item(saved_id: int, body: Optional[str], refreshed_at: Optional[str], cache: Optional[str],
+                        error: Optional[str]) -> str:
+        if error is not None:
+            return f'{{"saved_id":{saved_id},"error":{json.dumps(error)}}}'
+        return (f'{{"saved_id":{saved_id},"refreshed_at":{json.dumps(refreshed_at)},'
+                f'"cache":"{cache}","result":{body}}}')
+
+    @app.post(
+        "/api/saved/run", response_model=SavedRunResponse, tags=["saved-searches"],
+        dependencies=[Depends(limiter.limit("2/second"))],
+    )
+    async def saved_run(
+        payload: SavedRunRequest,
+        fmt: Literal["json", "ndjson"] = Query("json", alias="format"),
+    ):
+        """
+        Run many saved searches in one round trip (e.g. a dashboard's whole
+        watchlist). Saved searches with identical params run once; ones that
+        differ only in limit or summary length share one upstream fetch. At most
+        SAVED_RUN_CONCURRENCY distinct searches run at a time, and fresh cached
+        /api/search results are reused. Results are also stored for
+        GET /api/saved/{id}/result. format=ndjson streams one `result` record
+        per saved search as its search finishes, then a `done` record.
+        """
+        started = time.perf_counter()
+        ids = list(dict.fromkeys(payload.ids)) if payload.ids is not None else None
+        if ids is not None and len(ids) > SAVED_RUN_MAX:
+            raise HTTPException(400, f"At most {SAVED_RUN_MAX} saved searches per run")
+        rows = dict(await asyncio.to_thread(load_saved_many, ids, SAVED_RUN_MAX))
+        order = ids if ids is not None else list(rows)
+
+        # Group by normalized params (the /api/search cache key): each group runs once
+        errors: dict[int, str] = {}
+        groups: dict[str, tuple[dict, object, dict, list[int]]] = {}
+        shared = SharedFetch()
+        for sid in order:
+            args = _saved_search_args(rows[sid]) if sid in rows else None
+            if args is None:
+                errors[sid] = "Not found" if sid not in rows else "Saved search params are not a valid search"
+                continue
+            key = make_cache_key(**args)
+            if key not in groups:
+                try:
+                    impl, opts = _make_provider(
+                        args["provider"], args["date_from"], args["date_to"], args["domains"], args["sources"],
+                    )
+                except HTTPException as e:
+                    errors[sid] = str(e.detail)
+                    continue
+                groups[key] = (args, impl, opts, [])
+                shared.want(args["provider"], args["query"], args["limit"], opts)
+            groups[key][3].append(sid)
+
+        sem = asyncio.Semaphore(SAVED_RUN_CONCURRENCY)
+
+        async def _run_group(key: str) -> tuple[str, Optional[str], Optional[str], Optional[str]]:
+            args, impl, opts, _ids = groups[key]
+            async with sem:
+                try:
+                    if search_cache.enabled:
+                        entry = await search_cache.get(key)
+                        if entry.body is not None and entry.state == "hit":
+                            return key, entry.body, "HIT", None
+                    body, _count = await _run_saved_args(args, impl, opts, key, shared)
+                    return key, body, "MISS", None
+                except Exception as e:
+                    return key, None, None, _error_detail(e, "saved-run")
+
+        async def _items(done: tuple[str, Optional[str], Optional[str], Optional[str]]) -> list[tuple[int, str]]:
+            key, body, cache, error = done
+            out = []
+            for sid in groups[key][3]:
+                refreshed_at = await saved_refresher.store_result(sid, body) if body is not None else None
+                out.append((sid, _saved_run_item(sid, body, refreshed_at, cache, error)))
+            return out
+
+        def _summary() -> str:
+            return (f'"count":{len(order)},"unique":{len(groups)},'
+                    f'"elapsed_ms":{round((time.perf_counter() - started) * 1000, 1)}')
+
+        tasks = [asyncio.ensure_future(_run_group(key)) for key in groups]
+
+        if fmt == "ndjson":
+            async def _records() -> AsyncIterator[str]:
+                try:
+                    for sid, error in errors.items():
+                        yield '{"type":"result",' + _saved_run_item(sid, None, None, None, error)[1:] + "\n"
+                    for fut in asyncio.as_completed(tasks):
+                        for _sid, item in await _items(await fut):
+                            yield '{"type":"result",' + item[1:] + "\n"
+                    yield '{"type":"done",' + _summary() + "}\n"
+                finally:
+                    for t in tasks:
+                        t.cancel()
+                    shared.close()
+
+            return StreamingResponse(
+                _records(), media_type="application/x-ndjson",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        try:
+            by_id = {sid: item for done in await asyncio.gather(*tasks) for sid, item in await _items(done)}
+        finally:
+            shared.close()
+        by_id.update((sid, _saved_run_item(sid, None, None, None, error)) for sid, error in errors.items())
+        content = "{" + _summary() + ',"items":[' + ",".join(by_id[sid] for sid in order) + "]}"
+        return Response(content=content, media_type="application/json")
+
 # ---------- Debug ----------
-@app.get("/api/whoami")
-@limiter.limit("2/second")
+@app.get("/api/whoami", dependencies=[Depends(limiter.limit("2/second"))])
 async def whoami(request: Request):
     chosen_ip, ctx = _pick_client_ip(request)
     return {
@@ -312,8 +566,7 @@ async def whoami(request: Request):
         "peer": get_remote_address(request),
     }
 
-@app.get("/api/diag/addr")
-@limiter.limit("2/second")
+@app.get("/api/diag/addr", dependencies=[Depends(limiter.limit("2/second"))])
 async def diag_addr(request: Request):
     chosen_ip, ctx = _pick_client_ip(request)
     return {
@@ -379,8 +632,7 @@ async def kafka_emit(payload: dict, request: Request):
     return {"ok": True, "bytes": len(data)}
 
 # ---------- Core endpoints ----------
-@app.get("/api/health")
-@limiter.limit("1/second")
+@app.get("/api/health", dependencies=[Depends(limiter.limit("1/second"))])
 async def health(request: Request):
     return {"status": "ok", "time": dt.datetime.now(dt.timezone.utc).isoformat()}
 
@@ -388,8 +640,11 @@ async def health(request: Request):
 async def diag():
     return {
         "newsapi_key_set": bool(NEWSAPI_KEY),
+        "newsapi_pass_mode": NEWSAPI_PASS_MODE,
+        "newsapi_quota_remaining": newsapi_governor.remaining,
         "allowed_origins": ALLOWED_ORIGINS,
-        "providers": ["rss", "newsapi"],
+        "providers": ["rss", "newsapi", "local"],
+        "local_index_docs": len(article_index),
         "db_enabled": bool(DB_OK),
         "version": "0.6.1",
     }
@@ -408,97 +663,457 @@ async def diag_sources(
     if (date_from and not df) or (date_to and not dt_):
         raise HTTPException(400, "Dates must be YYYY-MM-DD")
 
-    provider = NewsAPIProvider(NEWSAPI_KEY)
+    quota_priority.set("background")  # why: probing sources must not eat the interactive reserve
+    provider = _newsapi_provider()
     tested = [s.strip() for s in items.split(",") if s.strip()]
     results: dict[str, int] = {}
 
-    async with httpx.AsyncClient(follow_redirects=True, headers={"User-Agent": "FinNewsSummarizer/1.0"}) as client:
-        for it in tested:
-            ok = False
-            try:
-                got = await provider.fetch("stocks OR earnings", limit, client, date_from=df, date_to=dt_, sources=it)
-                results[it] = len(got)
-                ok = True
-            except Exception:
-                pass
-            if ok:
-                continue
-            try:
-                got = await provider.fetch("stocks OR earnings", limit, client, date_from=df, date_to=dt_, domains=it)
-                results[it] = len(got)
-            except Exception:
-                results[it] = 0
+    for it in tested:
+        ok = False
+        try:
+            got = await provider.fetch("stocks OR earnings", limit, date_from=df, date_to=dt_, sources=it)
+            results[it] = len(got)
+            ok = True
+        except Exception:
+            pass
+        if ok:
+            continue
+        try:
+            got = await provider.fetch("stocks OR earnings", limit, date_from=df, date_to=dt_, domains=it)
+            results[it] = len(got)
+        except Exception:
+            results[it] = 0
     return {"tested": tested, "results": results}
 
-@app.get("/api/search", response_model=SearchResponse)
-@limiter.limit("5/second")
+def _make_provider(
+    provider: str,
+    df: Optional[str],
+    dt_: Optional[str],
+    domains: Optional[str],
+    sources: Optional[str],
+):
+    if provider == "rss":
+        return RSSProvider(RSS_FEEDS, RSS_FEED_TIMEOUT, rss_feed_cache), {}
+    opts = {
+        "date_from": df,
+        "date_to": dt_,
+        "domains": (domains or "").strip() or None,
+        "sources": (sources or "").strip() or None,
+    }
+    if provider == "local":
+        return LocalProvider(article_index), opts
+    if not NEWSAPI_KEY:
+        raise HTTPException(400, "NEWSAPI_KEY not set; add it to backend/.env and restart.")
+    return _newsapi_provider(), opts
+
+async def _run_search(impl, opts: dict, query: str, limit: int, provider: str, summarize_sentences: int) -> list[dict]:
+    """Fetch and enrich; returns article_fields() dicts ready for search_response_json()."""
+    token = current_provider.set(provider)  # labels upstream HTTP metrics for this search
+    try:
+        # Shared per-worker pool: keep-alive connections skip the TCP+TLS handshake
+        with stage("fetch"):
+            raw = await impl.fetch(query, limit, **opts)  # type: ignore[attr-defined]
+        if provider != "local":
+            with stage("index"):
+                article_index.add_many(raw)
+
+        # One analysis pass per article feeds both the summary and the sentiment score
+        with stage("summarize"):
+            summaries, docs = summarize_articles(raw, max_sentences=summarize_sentences)
+        with stage("sentiment"):
+            sentiments = sentiment_from_tokens_batch(docs)
+
+        with stage("validate"):
+            articles = [article_fields(it, summ, sent) for it, summ, sent in zip(raw, summaries, sentiments)]
+        ARTICLES_PROCESSED.labels(provider).inc(len(articles))
+        return articles
+    finally:
+        current_provider.reset(token)
+
+async def _compute_search(
+    impl, opts: dict, cache_key: str, query: str, limit: int, provider: str, summarize_sentences: int,
+) -> tuple[str, int]:
+    priority = quota_priority.get()
+
+    async def _once() -> tuple[str, int, dict[str, float]]:
+        # why: the flight runs in its own context, shared by every caller that joins it
+        quota_priority.set(priority)
+        timings = collect_server_timing()
+        articles = await _run_search(impl, opts, query, limit, provider, summarize_sentences)
+        with stage("serialize", provider):
+            return search_response_json(query, provider, articles), len(articles), timings
+
+    # Identical concurrent searches share one upstream fetch + enrichment; background work
+    # (refresh, batch) gets its own in-worker flights so users never inherit its quota priority
+    body, count, timings = await singleflight.do(cache_key, _once, scope=priority)
+    merge_server_timing(timings)
+    return body, count
+
+def _saved_search_args(params: dict) -> Optional[dict]:
+    """Validate stored SavedSearch.params the way /api/search validates its query string."""
+    query = str(params.get("query") or "").strip()
+    provider = params.get("provider") or "rss"
+    if not query or provider not in ("rss", "newsapi", "local"):
+        return None
+    try:
+        limit = min(50, max(1, int(params.get("limit") or 10)))
+        sentences = min(6, max(1, int(params.get("summarize_sentences") or 3)))
+    except (TypeError, ValueError):
+        return None
+    raw_from, raw_to = params.get("date_from"), params.get("date_to")
+    df = _clean_date(str(raw_from)) if raw_from else None
+    dt_ = _clean_date(str(raw_to)) if raw_to else None
+    if (raw_from and not df) or (raw_to and not dt_):
+        return None
+    return {
+        "query": query,
+        "provider": provider,
+        "limit": limit,
+        "summarize_sentences": sentences,
+        "date_from": df,
+        "date_to": dt_,
+        "domains": str(params.get("domains") or "") or None,
+        "sources": str(params.get("sources") or "") or None,
+    }
+
+async def _run_saved_args(
+    args: dict, impl, opts: dict, cache_key: str, shared: Optional[SharedFetch] = None,
+) -> tuple[str, int]:
+    if shared is not None and args["provider"] != "local":
+        impl = shared.wrap(impl, args["provider"])  # why: batch runs share upstream fetches
+    body, count = await _compute_search(
+        impl, opts, cache_key, args["query"], args["limit"], args["provider"], args["summarize_sentences"],
+    )
+    if search_cache.enabled:
+        await search_cache.set(cache_key, body, count)  # why: also warms plain /api/search for these params
+    return body, count
+
+async def _run_saved_params(params: dict) -> Optional[tuple[str, int]]:
+    args = _saved_search_args(params)
+    if args is None:
+        return None
+    impl, opts = _make_provider(args["provider"], args["date_from"], args["date_to"], args["domains"], args["sources"])
+    return await _run_saved_args(args, impl, opts, make_cache_key(**args))
+
+async def _emit_search_event(request: Request, query: str, limit: int, provider: str, count: int) -> None:
+    # Queued for the background sender; never waits on Kafka itself
+    if ENABLE_KAFKA and getattr(app.state, "kafka_producer", None):
+        evt = {
+            "ts": dt.datetime.now(dt.timezone.utc).isoformat(),
+            "query": query,
+            "limit": limit,
+            "provider": provider,
+            "count": count,
+            "ip": _client_ip(request),
+        }
+        with stage("kafka_emit", provider):
+            await kafka_events.publish(json.dumps(evt).encode("utf-8"), key=query.encode("utf-8"))
+
+@app.get("/api/search", response_model=SearchResponse, dependencies=[Depends(limiter.limit("5/second"))])
 async def search(
     request: Request,
     query: str = Query(min_length=1),
     limit: int = Query(10, ge=1, le=50),
-    provider: Literal["rss", "newsapi"] = Query("rss"),
+    provider: Literal["rss", "newsapi", "local"] = Query("rss"),
     summarize_sentences: int = Query(3, ge=1, le=6),
-    date_from: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi only)"),
-    date_to: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi only)"),
-    domains: Optional[str] = Query(None, description="Comma-separated domains, e.g. reuters.com,bloomberg.com (newsapi only)"),
-    sources: Optional[str] = Query(None, description="Comma-separated NewsAPI source IDs, e.g. reuters,bloomberg (newsapi only)"),
+    date_from: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi/local only)"),
+    date_to: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi/local only)"),
+    domains: Optional[str] = Query(None, description="Comma-separated domains, e.g. reuters.com,bloomberg.com (newsapi/local only)"),
+    sources: Optional[str] = Query(None, description="Comma-separated NewsAPI source IDs, e.g. reuters,bloomberg (newsapi/local only)"),
 ):
-    effective_query = query
     df = _clean_date(date_from)
     dt_ = _clean_date(date_to)
     if (date_from and not df) or (date_to and not dt_):
         raise HTTPException(400, "Dates must be YYYY-MM-DD")
 
-    if provider == "rss":
-        impl = RSSProvider()
-        opts: dict = {}
+    impl, opts = _make_provider(provider, df, dt_, domains, sources)
+    timings = collect_server_timing() if SERVER_TIMING_ENABLED else None
+
+    def _respond(body: str, headers: Optional[dict] = None) -> Response:
+        headers = dict(headers or {})
+        if timings is not None:
+            headers["Server-Timing"] = server_timing_header(timings)
+            headers["Timing-Allow-Origin"] = ", ".join(ALLOWED_ORIGINS) or "*"  # why: lets the SPA read it cross-origin
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    if provider == "local":
+        # In-process index answers in milliseconds; no cache or upstream coalescing needed
+        articles = await _run_search(impl, opts, query, limit, provider, summarize_sentences)
+        with stage("serialize", provider):
+            body = search_response_json(query, provider, articles)
+        await _emit_search_event(request, query, limit, provider, len(articles))
+        return _respond(body)
+
+    cache_key = make_cache_key(
+        query=query, provider=provider, limit=limit, summarize_sentences=summarize_sentences,
+        date_from=df, date_to=dt_, domains=domains, sources=sources,
+    )
+
+    async def _compute() -> tuple[str, int]:
+        return await _compute_search(impl, opts, cache_key, query, limit, provider, summarize_sentences)
+
+    if not search_cache.enabled:
+        body, count = await _compute()
+        await _emit_search_event(request, query, limit, provider, count)
+        return _respond(body)
+
+    # Debug: "X-Cache-Bypass: 1" skips the read but still stores the fresh result
+    if request.headers.get("x-cache-bypass") == "1":
+        SEARCH_CACHE_REQUESTS.labels("bypass").inc()
+        cache_state = "BYPASS"
     else:
-        if not NEWSAPI_KEY:
-            raise HTTPException(400, "NEWSAPI_KEY not set; add it to backend/.env and restart.")
-        impl = NewsAPIProvider(NEWSAPI_KEY)
-        opts = {
-            "date_from": df,
-            "date_to": dt_,
-            "domains": (domains or "").strip() or None,
-            "sources": (sources or "").strip() or None,
-        }
+        with stage("cache", provider):
+            entry = await search_cache.get(cache_key)
+        if entry.body is not None:
+            if entry.state == "stale":
+                search_cache.refresh_in_background(cache_key, _compute)
+            await _emit_search_event(request, query, limit, provider, entry.count)
+            return _respond(entry.body, {"X-Cache": entry.state.upper()})
+        cache_state = "MISS"
+
+    body, count = await _compute()
+    await search_cache.set(cache_key, body, count)
+    await _emit_search_event(request, query, limit, provider, count)
+    return _respond(body, {"X-Cache": cache_state})
 
-    async with httpx.AsyncClient(follow_redirects=True, headers={"User-Agent": "FinNewsSummarizer/1.0"}) as client:
-        raw = await impl.fetch(effective_query, limit, client, **opts)  # type: ignore[attr-defined]
-
-    articles: list[Article] = []
-    for it in raw:
-        base_text = it.get("description") or ""
-        summ = summarize(base_text, max_sentences=summarize_sentences) if base_text else ""
-        sent = quick_sentiment(f"{it.get('title','')} {summ}")
-        articles.append(Article(
-            title=it.get("title", "").strip(),
-            url=it.get("url", "https://example.com"),
-            source=it.get("source", "Unknown"),
-            published_at=it.get("published_at"),
-            summary=summ,
-            sentiment=sent,
-            image_url=it.get("image_url"),
+async def _charge_batch_quota(request: Request, cost: int) -> None:
+    """Take `cost` queries from the caller's SEARCH_BATCH_RATE window; 429 once it is spent."""
+    if cost <= 0:
+        return
+    amount = parse_limit(SEARCH_BATCH_RATE).amount
+    if cost > amount:
+        raise HTTPException(400, f"Batch needs {cost} queries; SEARCH_BATCH_RATE allows {amount}")
+    await limiter.check(request, SEARCH_BATCH_RATE, "search_batch", cost=cost)
+
+def _error_detail(e: BaseException, where: str) -> str:
+    """Error text safe for clients: HTTPException details as-is; anything else is logged, not echoed."""
+    if isinstance(e, HTTPException):
+        return str(e.detail)
+    # why: exception text can carry upstream URLs, NewsAPI's apiKey= included
+    print(f"[{where}] {type(e).__name__}: {e}")
+    return "Search failed"
+
+# why: SEARCH_BATCH_RATE is charged per distinct query, so it's checked once the body is parsed;
+# the route is marked so the app-wide RATE_LIMIT doesn't cap it below that budget as well
+@app.post(
+    "/api/search/batch",
+    response_model=SearchBatchResponse,
+    dependencies=[Depends(limiter.checked_in_handler(SEARCH_BATCH_RATE))],
+)
+async def search_batch(request: Request, payload: SearchBatchRequest):
+    """
+    Many /api/search queries in one call (bulk jobs). Identical specs are merged
+    and charged once against SEARCH_BATCH_RATE; fresh cached results are reused.
+    Misses are fetched at most SEARCH_BATCH_CONCURRENCY at a time over the
+    shared upstream pool (specs differing only in limit/summary length share a
+    fetch), then all their articles are enriched in one pass. Each spec gets
+    its result or its own error, in request order.
+    """
+    started = time.perf_counter()
+    quota_priority.set("background")  # why: bulk jobs leave the reserved NewsAPI budget to /api/search
+    specs = payload.searches
+    if len(specs) > SEARCH_BATCH_MAX:
+        raise HTTPException(400, f"At most {SEARCH_BATCH_MAX} searches per batch")
+
+    errors: dict[int, str] = {}
+    groups: dict[str, tuple] = {}  # cache key -> (spec, date_from, date_to, [indexes])
+    for i, spec in enumerate(specs):
+        df = _clean_date(spec.date_from)
+        dt_ = _clean_date(spec.date_to)
+        if (spec.date_from and not df) or (spec.date_to and not dt_):
+            errors[i] = "Dates must be YYYY-MM-DD"
+            continue
+        key = make_cache_key(
+            query=spec.query, provider=spec.provider, limit=spec.limit, summarize_sentences=spec.summarize_sentences,
+            date_from=df, date_to=dt_, domains=spec.domains, sources=spec.sources,
+        )
+        groups.setdefault(key, (spec, df, dt_, []))[3].append(i)
+    await _charge_batch_quota(request, len(groups))
+
+    bodies: dict[str, tuple[str, str]] = {}  # cache key -> (SearchResponse JSON, HIT | MISS)
+    group_errors: dict[str, str] = {}
+    if search_cache.enabled and request.headers.get("x-cache-bypass") != "1":
+        with stage("cache", "batch"):
+            entries = await asyncio.gather(*(search_cache.get(k) for k in groups))
+        for key, entry in zip(groups, entries):
+            if entry.body is not None and entry.state == "hit":
+                bodies[key] = (entry.body, "HIT")
+
+    shared = SharedFetch()
+    impls: dict[str, tuple] = {}
+    for key, (spec, df, dt_, _idx) in groups.items():
+        if key in bodies:
+            continue
+        try:
+            impls[key] = _make_provider(spec.provider, df, dt_, spec.domains, spec.sources)
+        except HTTPException as e:
+            group_errors[key] = str(e.detail)
+            continue
+        shared.want(spec.provider, spec.query, spec.limit, impls[key][1])
+
+    sem = asyncio.Semaphore(SEARCH_BATCH_CONCURRENCY)
+
+    async def _fetch(key: str) -> list[dict]:
+        spec = groups[key][0]
+        impl, opts = impls[key]
+        current_provider.set(spec.provider)  # why: each gather task has its own context
+        async with sem:
+            if spec.provider == "local":
+                return await impl.fetch(spec.query, spec.limit, **opts)
+            return await shared.fetch(impl, spec.provider, spec.query, spec.limit, opts)
+
+    keys = list(impls)
+    try:
+        with stage("fetch", "batch"):
+            raws = await asyncio.gather(*(_fetch(k) for k in keys), return_exceptions=True)
+    finally:
+        shared.close()
+    fetched: list[tuple[str, list[dict]]] = []
+    for key, raw in zip(keys, raws):
+        if isinstance(raw, BaseException):
+            group_errors[key] = _error_detail(raw, "search-batch")
+        else:
+            fetched.append((key, raw))
+
+    with stage("index", "batch"):
+        for key, raw in fetched:
+            if groups[key][0].provider != "local":
+                article_index.add_many(raw)
+    # One summarize pass per distinct sentence count and one sentiment pass for every article
+    with stage("enrich", "batch"):
+        enriched = enrich_many([(raw, groups[key][0].summarize_sentences) for key, raw in fetched])
+
+    fresh: list[tuple[str, str, int]] = []
+    with stage("validate", "batch"):
+        for (key, raw), pairs in zip(fetched, enriched):
+            spec = groups[key][0]
+            try:
+                articles = [article_fields(it, summ, sent) for it, (summ, sent) in zip(raw, pairs)]
+            except Exception as e:
+                group_errors[key] = _error_detail(e, "search-batch")
+                continue
+            ARTICLES_PROCESSED.labels(spec.provider).inc(len(articles))
+            body = search_response_json(spec.query, spec.provider, articles)
+            bodies[key] = (body, "MISS")
+            fresh.append((key, body, len(articles)))
+    if search_cache.enabled:
+        await asyncio.gather(*(
+            search_cache.set(k, body, count) for k, body, count in fresh if groups[k][0].provider != "local"
         ))
+    for key, _body, count in fresh:
+        spec = groups[key][0]
+        await _emit_search_event(request, spec.query, spec.limit, spec.provider, count)
 
-    # Fire-and-forget Kafka event
-    if ENABLE_KAFKA and getattr(app.state, "kafka_producer", None):
-        evt = {
-            "ts": dt.datetime.now(dt.timezone.utc).isoformat(),
+    items: list[str] = [""] * len(specs)
+    for i, error in errors.items():
+        items[i] = f'{{"index":{i},"error":{json.dumps(error)}}}'
+    for key, (_spec, _df, _dt, indexes) in groups.items():
+        for i in indexes:
+            if key in bodies:
+                body, cache = bodies[key]
+                items[i] = f'{{"index":{i},"cache":"{cache}","result":{body}}}'
+            else:
+                items[i] = f'{{"index":{i},"error":{json.dumps(group_errors.get(key, "failed"))}}}'
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    # why: splice the serialized results instead of re-validating them through SearchBatchResponse
+    content = (f'{{"count":{len(specs)},"unique":{len(groups)},"elapsed_ms":{elapsed_ms},'
+               f'"items":[{",".join(items)}]}}')
+    return Response(content=content, media_type="application/json")
+
+def _stream_frame(fmt: str, kind: str, data: dict) -> str:
+    if fmt == "sse":
+        return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+    return json.dumps({"type": kind, **data}, separators=(",", ":")) + "\n"
+
+async def _iter_batches(impl, opts: dict, query: str, limit: int) -> AsyncIterator[list[dict]]:
+    # Providers with stream() yield per-source batches; the rest deliver one batch
+    stream = getattr(impl, "stream", None)
+    if stream is None:
+        yield await impl.fetch(query, limit, **opts)  # type: ignore[attr-defined]
+        return
+    async for batch in stream(query, limit, **opts):
+        yield batch
+
+@app.get("/api/search/stream", dependencies=[Depends(limiter.limit("5/second"))])
+async def search_stream(
+    request: Request,
+    query: str = Query(min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    provider: Literal["rss", "newsapi", "local"] = Query("rss"),
+    summarize_sentences: int = Query(3, ge=1, le=6),
+    date_from: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi/local only)"),
+    date_to: Optional[str] = Query(None, description="YYYY-MM-DD (newsapi/local only)"),
+    domains: Optional[str] = Query(None, description="Comma-separated domains (newsapi/local only)"),
+    sources: Optional[str] = Query(None, description="Comma-separated NewsAPI source IDs (newsapi/local only)"),
+    fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format"),
+):
+    """
+    Same search as /api/search, streamed: one `article` record per enriched
+    article as soon as its source answers, then a `done` record with the count
+    (or an `error` record). RSS articles arrive in feed-completion order, not
+    globally sorted. A cached /api/search result is replayed if present.
+    """
+    df = _clean_date(date_from)
+    dt_ = _clean_date(date_to)
+    if (date_from and not df) or (date_to and not dt_):
+        raise HTTPException(400, "Dates must be YYYY-MM-DD")
+
+    impl, opts = _make_provider(provider, df, dt_, domains, sources)
+
+    cached = None
+    if provider != "local" and search_cache.enabled and request.headers.get("x-cache-bypass") != "1":
+        cache_key = make_cache_key(
+            query=query, provider=provider, limit=limit, summarize_sentences=summarize_sentences,
+            date_from=df, date_to=dt_, domains=domains, sources=sources,
+        )
+        with stage("cache", provider):
+            entry = await search_cache.get(cache_key)
+        if entry.body is not None:
+            cached = entry
+            if entry.state == "stale":
+                search_cache.refresh_in_background(
+                    cache_key,
+                    lambda: _compute_search(impl, opts, cache_key, query, limit, provider, summarize_sentences),
+                )
+
+    async def _records() -> AsyncIterator[str]:
+        started = time.perf_counter()
+        count = 0
+        current_provider.set(provider)  # why: the response streams from its own task context
+        try:
+            if cached is not None:
+                for art in json.loads(cached.body)["articles"]:
+                    count += 1
+                    yield _stream_frame(fmt, "article", art)
+            else:
+                async for raw in _iter_batches(impl, opts, query, limit):
+                    if provider != "local":
+                        with stage("index"):
+                            article_index.add_many(raw)
+                    with stage("summarize"):
+                        summaries, docs = summarize_articles(raw, max_sentences=summarize_sentences)
+                    with stage("sentiment"):
+                        sentiments = sentiment_from_tokens_batch(docs)
+                    for it, summ, sent in zip(raw, summaries, sentiments):
+                        art = article_fields(it, summ, sent)
+                        count += 1
+                        yield _stream_frame(fmt, "article", to_jsonable_python(art))
+                ARTICLES_PROCESSED.labels(provider).inc(count)
+        except Exception as e:
+            # Headers are already sent, so failures travel in-band
+            yield _stream_frame(fmt, "error", {"detail": _error_detail(e, "search-stream"), "count": count})
+            return
+        yield _stream_frame(fmt, "done", {
             "query": query,
-            "limit": limit,
             "provider": provider,
-            "count": len(articles),
-            "ip": _pick_client_ip(request)[0],
-        }
-        payload = json.dumps(evt).encode("utf-8")
-        asyncio.create_task(
-            app.state.kafka_producer.send_and_wait(
-                app.state.kafka_topic,
-                payload,
-                key=query.encode("utf-8"),
-            )
-        )
-        KAFKA_PRODUCED.labels(app.state.kafka_topic).inc()
+            "count": count,
+            "cache": "HIT" if cached is not None else "MISS",
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+        await _emit_search_event(request, query, limit, provider, count)
 
-    return SearchResponse(query=query, provider=provider, count=len(articles), articles=articles)
+    return StreamingResponse(
+        _records(),
+        media_type="text/event-stream" if fmt == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # why: nginx would buffer otherwise
+    )
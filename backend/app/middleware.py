@@ -0,0 +1,140 @@
+# backend/app/middleware.py
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Pure ASGI: these wrap send/receive directly instead of going through
+# BaseHTTPMiddleware, so there is no extra task per request and streaming
+# responses pass through chunk by chunk.
+
+_IP_RE = re.compile(rb"\s*([^,\s]+)\s*")
+
+SECURITY_HEADERS: list[tuple[bytes, bytes]] = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
+DEFAULT_CSP = (
+    b"default-src 'self' http://localhost:5173 data: blob:; "
+    b"img-src * data: blob:; connect-src *; "
+    b"style-src 'self' 'unsafe-inline' http://localhost:5173; "
+    b"script-src 'self' 'unsafe-inline'"
+)
+
+
+def resolve_client_ip(scope: Scope) -> tuple[str, str]:
+    """(ip, source) from CF-Connecting-IP, then the left-most X-Forwarded-For, X-Real-IP, then the peer."""
+    cf = xff = xreal = None
+    for name, value in scope.get("headers") or ():
+        if name == b"cf-connecting-ip":
+            cf = value
+        elif name == b"x-forwarded-for":
+            xff = value
+        elif name == b"x-real-ip":
+            xreal = value
+    if cf:
+        return cf.strip().decode("latin-1"), "cf-connecting-ip"
+    if xff:
+        m = _IP_RE.match(xff)
+        if m:
+            return m.group(1).decode("latin-1"), "x-forwarded-for"
+    if xreal:
+        return xreal.strip().decode("latin-1"), "x-real-ip"
+    client = scope.get("client")
+    return (client[0] if client else None) or "127.0.0.1", "peer"
+
+
+class ClientIPMiddleware:
+    """Resolve the client IP once per request into scope["client_ip"] / scope["client_ip_source"]."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope["client_ip"], scope["client_ip_source"] = resolve_client_ip(scope)
+        await self.app(scope, receive, send)
+
+
+class SecurityHeadersMiddleware:
+    """Add hardening headers to every HTTP response (a route's own CSP wins)."""
+
+    def __init__(self, app: ASGIApp, csp: bytes = DEFAULT_CSP) -> None:
+        self.app = app
+        self.csp = csp
+        self._names = {name for name, _ in SECURITY_HEADERS}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [(k, v) for k, v in message.get("headers", ()) if k.lower() not in self._names]
+                headers.extend(SECURITY_HEADERS)
+                if not any(k.lower() == b"content-security-policy" for k, _ in headers):
+                    headers.append((b"content-security-policy", self.csp))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class BodySizeLimitMiddleware:
+    """413 for request bodies over max_bytes, by Content-Length or as a chunked body streams in."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", b"17")],
+        })
+        await send({"type": "http.response.body", "body": b"Payload Too Large"})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        length: Optional[bytes] = None
+        for name, value in scope.get("headers") or ():
+            if name == b"content-length":
+                length = value
+                break
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes and not rejected:
+                    rejected = True
+                    if not started:
+                        await self._reject(send)
+                    return {"type": "http.disconnect"}  # why: the app stops reading; the 413 already went out
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            if rejected:
+                return  # why: drop whatever the app answers after the 413
+            await send(message)
+
+        await self.app(scope, limited_receive, tracked_send)
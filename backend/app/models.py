@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Optional, Literal, List
-from pydantic import BaseModel, HttpUrl
+from functools import lru_cache
+from typing import Any, Optional, Literal, List
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
+from pydantic_core import SchemaValidator, to_json
 
 class Article(BaseModel):
     """Single normalized news article."""
@@ -17,6 +19,92 @@ class Article(BaseModel):
 class SearchResponse(BaseModel):
     """Response envelope for /api/search."""
     query: str
-    provider: Literal["rss", "newsapi"]
+    provider: Literal["rss", "newsapi", "local"]
     count: int
-    articles: List[Article]
\ No newline at end of file
+    articles: List[Article]
+
+# Fast path for /api/search bodies: articles are built once as plain dicts holding the values
+# Article would hold after validation, then pydantic-core serializes them directly. Same bytes as
+# SearchResponse(...).model_dump_json() (bench/bench_serialize.py checks) without the per-Article
+# model construction. SearchResponse stays the documented response_model.
+_HTTP_URL = SchemaValidator(TypeAdapter(HttpUrl).core_schema)  # why: same schema, skips TypeAdapter's per-call overhead
+_DATETIME = TypeAdapter(Optional[dt.datetime])
+
+@lru_cache(maxsize=16384)
+def normalize_url(url: str) -> str:
+    """URL as HttpUrl normalizes it; cached since the same links come back across searches."""
+    return str(_HTTP_URL.validate_python(url))
+
+def article_fields(it: dict, summary: str, sentiment: Optional[float]) -> dict[str, Any]:
+    """One provider item as Article's fields (raises ValidationError on a bad URL or date, like Article)."""
+    published = it.get("published_at")
+    image_url = it.get("image_url")
+    return {
+        "title": it.get("title", "").strip(),
+        "url": normalize_url(it.get("url", "https://example.com")),
+        "source": it.get("source", "Unknown"),
+        "published_at": published if published is None or isinstance(published, dt.datetime)
+        else _DATETIME.validate_python(published),
+        "summary": summary,
+        "sentiment": None if sentiment is None else float(sentiment),
+        "image_url": None if image_url is None else normalize_url(image_url),
+    }
+
+def search_response_json(query: str, provider: str, articles: List[dict[str, Any]]) -> str:
+    """SearchResponse JSON for article_fields() dicts, byte-identical to model_dump_json()."""
+    payload = {"query": query, "provider": provider, "count": len(articles), "articles": articles}
+    return to_json(payload, inf_nan_mode="null").decode()  # why: models write NaN/inf as null
+
+class SavedSearchResult(BaseModel):
+    """Pre-computed /api/search result for a saved search."""
+    saved_id: int
+    refreshed_at: dt.datetime
+    result: SearchResponse
+
+class SavedRunRequest(BaseModel):
+    """Body for POST /api/saved/run."""
+    ids: Optional[List[int]] = Field(None, description="Saved-search ids to run; omit to run all of them")
+
+class SavedRunItem(BaseModel):
+    """One saved search in a batch run: its result, or why it has none."""
+    saved_id: int
+    refreshed_at: Optional[dt.datetime] = None
+    cache: Optional[str] = None  # HIT | MISS
+    result: Optional[SearchResponse] = None
+    error: Optional[str] = None
+
+class SavedRunResponse(BaseModel):
+    """Response envelope for POST /api/saved/run."""
+    count: int
+    unique: int  # distinct parameter sets actually run
+    elapsed_ms: float
+    items: List[SavedRunItem]
+
+class SearchSpec(BaseModel):
+    """One query in POST /api/search/batch (same fields as the /api/search query string)."""
+    query: str = Field(min_length=1)
+    limit: int = Field(10, ge=1, le=50)
+    provider: Literal["rss", "newsapi", "local"] = "rss"
+    summarize_sentences: int = Field(3, ge=1, le=6)
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    domains: Optional[str] = None
+    sources: Optional[str] = None
+
+class SearchBatchRequest(BaseModel):
+    """Body for POST /api/search/batch."""
+    searches: List[SearchSpec] = Field(min_length=1)
+
+class SearchBatchItem(BaseModel):
+    """Result (or error) for searches[index]."""
+    index: int
+    cache: Optional[str] = None  # HIT | MISS
+    result: Optional[SearchResponse] = None
+    error: Optional[str] = None
+
+class SearchBatchResponse(BaseModel):
+    """Response envelope for POST /api/search/batch."""
+    count: int
+    unique: int  # distinct searches after merging identical specs
+    elapsed_ms: float
+    items: List[SearchBatchItem]
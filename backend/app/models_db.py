@@ -15,11 +15,17 @@ class SavedSearch(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(200), nullable=False)
     params = Column(JSON, nullable=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=sa_func.now())
+    # Python-side default keeps one timestamp format on SQLite, so cursor comparisons are exact
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=sa_func.now(),
+        default=lambda: dt.datetime.now(dt.timezone.utc),
+    )
 
     __table_args__ = (
         Index("ix_saved_searches_name_ci", func.lower(name), postgresql_using="btree"),
         Index("ix_saved_searches_created_at_desc", created_at.desc(), postgresql_using="btree"),
+        # Composite keyset for order=created_at; btrees scan it backwards for the other direction
+        Index("ix_saved_searches_created_at_id", created_at, id, postgresql_using="btree"),
         Index("ix_saved_searches_id_desc", id.desc(), postgresql_using="btree"),
     )
 
@@ -37,7 +43,8 @@ class SavedSearchOut(BaseModel):
     created_at: dt.datetime  # ISO 8601 in responses
 
 class SavedSearchPage(BaseModel):
-    """Paged list response with keyset cursor."""
+    """Paged list response with an opaque keyset cursor."""
     model_config = ConfigDict(from_attributes=True)
     items: List[SavedSearchOut]
-    next_cursor: int | None
\ No newline at end of file
+    next_cursor: str | None
+    has_more: bool = False
\ No newline at end of file
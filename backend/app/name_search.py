@@ -0,0 +1,145 @@
+# backend/app/name_search.py
+from __future__ import annotations
+
+import time
+from typing import Literal, Optional
+
+from sqlalchemy import case, column, func, literal, select, table, text
+from sqlalchemy.engine import Engine
+
+from app.models_db import SavedSearch
+
+Match = Literal["contains", "prefix", "ranked"]
+
+# Which index backs the `q` filter: trgm (Postgres pg_trgm GIN), fts5 (SQLite
+# trigram FTS5 table) or like (no text index; plain LIKE scan). Set at startup.
+backend: str = "like"
+
+FTS_TABLE = "saved_searches_fts"
+_fts = table(FTS_TABLE, column("rowid"), column("name"), column("rank"))
+
+_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, content='saved_searches', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS saved_searches_fts_ai AFTER INSERT ON saved_searches BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS saved_searches_fts_ad AFTER DELETE ON saved_searches BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS saved_searches_fts_au AFTER UPDATE OF name ON saved_searches BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",  # index rows that predate the table
+)
+
+
+def _create_index(conn, dialect: str) -> None:
+    if dialect == "postgresql":
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_saved_searches_name_trgm "
+            "ON saved_searches USING gin (lower(name) gin_trgm_ops)"
+        )
+    elif not _index_exists(conn, dialect):
+        for ddl in _SQLITE_DDL:
+            conn.exec_driver_sql(ddl)
+
+
+def _index_exists(conn, dialect: str) -> bool:
+    if dialect == "postgresql":
+        sql, args = "SELECT 1 FROM pg_indexes WHERE indexname = %s", ("ix_saved_searches_name_trgm",)
+    else:
+        sql, args = "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (FTS_TABLE,)
+    return conn.exec_driver_sql(sql, args).first() is not None
+
+
+def ensure_name_index(engine: Engine, attempts: int = 3) -> str:
+    """Create the name-search index for this dialect (idempotent) and return the backend in use.
+
+    Workers start together and race on the DDL; a worker that loses (duplicate
+    extension/table, locked database) re-checks and uses the index the winner
+    built. LIKE is only the fallback when the index can't be built at all.
+    """
+    global backend
+    dialect = engine.url.get_backend_name()
+    if dialect not in ("postgresql", "sqlite"):
+        return backend
+    for attempt in range(1, attempts + 1):
+        try:
+            with engine.begin() as conn:
+                _create_index(conn, dialect)
+            backend = "trgm" if dialect == "postgresql" else "fts5"
+            return backend
+        except Exception as e:
+            try:
+                with engine.connect() as conn:
+                    if _index_exists(conn, dialect):  # why: another worker created it concurrently
+                        backend = "trgm" if dialect == "postgresql" else "fts5"
+                        return backend
+            except Exception:
+                pass
+            if attempt == attempts:  # why: no CREATE EXTENSION privilege, or SQLite built without FTS5 trigram
+                print(f"[db] name search index unavailable ({e}); falling back to LIKE scans")
+            else:
+                time.sleep(0.2 * attempt)
+    backend = "like"
+    return backend
+
+
+def _like_escape(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _fts_match(q: str):
+    return text(f"{FTS_TABLE} MATCH :phrase").bindparams(phrase='"' + q.replace('"', '""') + '"')
+
+
+def apply_name_filter(
+    stmt, q: str, match: Match, limit: int, keyset: Optional[tuple[Optional[int], str]] = None,
+):
+    """
+    Filter `stmt` (a select of SavedSearch) by name. Returns (stmt, ranked):
+    when ranked is True the statement is already ordered by relevance and
+    limited, and the caller should not add keyset/presentation ordering.
+
+    keyset=(cursor, dir) when the page is ordered by id: the FTS5 lookup then
+    walks its doclist in id order and stops after `limit` hits, so frequent
+    terms cost the same as rare ones.
+    """
+    q = q.strip().lower()
+    pattern = _like_escape(q) + "%" if match == "prefix" else "%" + _like_escape(q) + "%"
+    name = func.lower(SavedSearch.name)
+    # why: trigram MATCH needs a full trigram, and FTS5 can't take LIKE ... ESCAPE from the index
+    fts_ok = backend == "fts5" and len(q) >= 3 and not any(ch in q for ch in "%_\\")
+
+    if match == "ranked":
+        if backend == "trgm":
+            # word_similarity (`<%`) scores q against the best-matching part of the name; GIN-indexed
+            score = func.word_similarity(literal(q), name)
+            return stmt.where(literal(q).op("<%")(name)).order_by(score.desc(), SavedSearch.id.desc()).limit(limit), True
+        if fts_ok:
+            # Rank inside FTS5 (bm25) and join only the top hits back to the table
+            top = select(_fts.c.rowid, _fts.c.rank).where(_fts_match(q)).order_by(_fts.c.rank).limit(limit).subquery()
+            return (
+                stmt.join(top, top.c.rowid == SavedSearch.id).order_by(top.c.rank, SavedSearch.id.desc())
+            ), True
+        # No text index: substring hits, prefix hits first, then shorter (closer) names
+        first = case((name.like(_like_escape(q) + "%", escape="\\"), 0), else_=1)
+        return (
+            stmt.where(name.like(pattern, escape="\\"))
+            .order_by(first, func.length(SavedSearch.name), SavedSearch.id.desc())
+            .limit(limit)
+        ), True
+
+    if fts_ok:
+        # Trigram phrase MATCH = case-insensitive substring match, answered from the FTS5 index
+        hits = select(_fts.c.rowid).where(_fts_match(q))
+        if match == "prefix":
+            hits = hits.where(_fts.c.name.like(q + "%"))
+        if keyset is not None:
+            cursor, dir = keyset
+            if cursor is not None:
+                hits = hits.where(_fts.c.rowid < cursor if dir == "desc" else _fts.c.rowid > cursor)
+            hits = hits.order_by(_fts.c.rowid.desc() if dir == "desc" else _fts.c.rowid.asc()).limit(limit)
+        return stmt.where(SavedSearch.id.in_(hits)), False
+    # Postgres: the pg_trgm GIN index on lower(name) serves LIKE '%q%' and 'q%'
+    return stmt.where(name.like(pattern, escape="\\")), False
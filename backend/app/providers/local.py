@@ -0,0 +1,45 @@
+# backend/app/providers/local.py
+from __future__ import annotations
+import datetime as dt
+from typing import Any
+
+from app.services.article_index import ArticleIndex, tokenize
+from app.providers.newsapi import TICKER_MAP
+
+def _csv_set(s: str | None) -> set[str] | None:
+    vals = {v.strip().lower() for v in (s or "").split(",") if v.strip()}
+    return vals or None
+
+class LocalProvider:
+    """Answers from the in-process ArticleIndex; no upstream calls."""
+    name = "local"
+
+    def __init__(self, index: ArticleIndex):
+        self.index = index
+
+    async def fetch(
+        self,
+        query: str,
+        limit: int,
+        client: Any = None,
+        *,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        domains: str | None = None,
+        sources: str | None = None,
+        **kwargs,
+    ) -> list[dict[str, Any]]:
+        terms = tokenize(query)
+        # Tickers also match the company name (AAPL -> apple), like NewsAPI query expansion
+        for t in list(terms):
+            name = TICKER_MAP.get(t.upper())
+            if name:
+                terms.extend(tokenize(name))
+        return self.index.search(
+            terms,
+            limit,
+            date_from=dt.date.fromisoformat(date_from) if date_from else None,
+            date_to=dt.date.fromisoformat(date_to) if date_to else None,
+            sources=_csv_set(sources),
+            domains=_csv_set(domains),
+        )
@@ -1,14 +1,40 @@
 # backend/app/providers/newsapi.py
 from __future__ import annotations
+import asyncio
 import datetime as dt
-from typing import Any
+import math
+import time
+from typing import Any, Literal
 import re
 
 import httpx
 from fastapi import HTTPException
+from prometheus_client import Counter, Histogram
+
+from app.http_pool import get_client
+from app.quota import QuotaExhausted, QuotaGovernor
+from app.timing import stage
+
+DEFAULT_BASE_URL = "https://newsapi.org"
 
 AGGREGATOR_BLOCKLIST = {"biztoc.com"}
 
+# pass: 1 = broad q, 2 = qInTitle, 3 = broadened finance terms
+# outcome: hit | empty | error | cancelled (a higher-priority parallel pass already won)
+NEWSAPI_PASS_SECONDS = Histogram(
+    "newsapi_pass_seconds",
+    "NewsAPI /v2/everything latency per query pass",
+    ["pass", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 12),
+)
+NEWSAPI_PASS_REQUESTS = Counter(
+    "newsapi_pass_requests_total",
+    "NewsAPI requests sent per query pass (each one spends quota, even if cancelled)",
+    ["pass", "mode"],
+)
+
+PassMode = Literal["sequential", "parallel", "auto"]
+
 TICKER_MAP = {
     "AAPL": "Apple", "MSFT": "Microsoft", "GOOGL": "Google", "GOOG": "Google",
     "AMZN": "Amazon", "NVDA": "Nvidia", "META": "Meta", "TSLA": "Tesla",
@@ -34,11 +60,35 @@ def _expand_query(q: str) -> str:
 class NewsAPIProvider:
     name = "newsapi"
 
-    def __init__(self, api_key: str | None):
+    def __init__(
+        self,
+        api_key: str | None,
+        base_url: str | None = None,
+        pass_mode: PassMode = "sequential",
+        governor: QuotaGovernor | None = None,
+        parallel_min_budget: int = 0,
+    ):
         self.api_key = (api_key or "").strip()
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.pass_mode = pass_mode
+        self.governor = governor
+        self.parallel_min_budget = parallel_min_budget
 
     async def _call(self, client: httpx.AsyncClient, params: dict) -> dict:
-        r = await client.get("https://newsapi.org/v2/everything", params=params, timeout=12)
+        # Every request goes through the shared quota: budget, priority and cluster-wide 429 backoff
+        if self.governor is not None:
+            try:
+                await self.governor.acquire()
+            except QuotaExhausted as e:
+                raise HTTPException(503, f"NewsAPI: {e}", headers={"Retry-After": str(math.ceil(e.retry_after))})
+        r = await client.get(f"{self.base_url}/v2/everything", params=params, timeout=12)
+        if r.status_code == 429:
+            retry_after = r.headers.get("retry-after")
+            wait = await self.governor.backoff(retry_after) if self.governor is not None else None
+            raise HTTPException(
+                503, "NewsAPI: rate limited upstream",
+                headers={"Retry-After": str(math.ceil(wait)) if wait is not None else (retry_after or "60")},
+            )
         r.raise_for_status()
         data = r.json()
         if data.get("status") != "ok":
@@ -46,6 +96,50 @@ class NewsAPIProvider:
             raise HTTPException(502, f"NewsAPI: {data.get('message') or 'error'}")
         return data
 
+    def _parallel(self) -> bool:
+        if self.pass_mode == "auto":
+            # Speculation can spend all three passes on one search; only do it while the shared
+            # (cluster-wide) bucket is ample. Unknown until this worker's first acquire: stay sequential.
+            if self.governor is None or not self.governor.capacity:
+                return True
+            left = self.governor.remaining
+            return left is not None and left >= self.parallel_min_budget
+        return self.pass_mode == "parallel"
+
+    async def _run_pass(self, client: httpx.AsyncClient, n: int, params: dict, mode: str) -> list[dict[str, Any]]:
+        NEWSAPI_PASS_REQUESTS.labels(str(n), mode).inc()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            data = await self._call(client, params)
+            with stage("parse", self.name):
+                items = self._project(data)
+            outcome = "hit" if items else "empty"
+            return items
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            NEWSAPI_PASS_SECONDS.labels(str(n), outcome).observe(time.perf_counter() - started)
+
+    async def _fetch_parallel(self, client: httpx.AsyncClient, passes: list[dict], limit: int) -> list[dict[str, Any]]:
+        """Start every pass at once; the first non-empty one in priority order wins, the rest are cancelled."""
+        tasks = [asyncio.ensure_future(self._run_pass(client, n, p, "parallel")) for n, p in enumerate(passes, 1)]
+        for t in tasks:
+            t.add_done_callback(lambda t: t.cancelled() or t.exception())  # why: losers' errors are expected
+        try:
+            for task in tasks[:-1]:
+                items = await task
+                if items:
+                    return items[:limit]
+            return (await tasks[-1])[:limit]
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     def _project(self, data: dict) -> list[dict[str, Any]]:
         items: list[dict[str, Any]] = []
         seen_titles: set[str] = set()
@@ -79,7 +173,7 @@ class NewsAPIProvider:
         self,
         query: str,
         limit: int,
-        client: httpx.AsyncClient,
+        client: httpx.AsyncClient | None = None,
         *,
         date_from: str | None = None,
         date_to: str | None = None,
@@ -88,6 +182,7 @@ class NewsAPIProvider:
     ) -> list[dict[str, Any]]:
         if not self.api_key:
             raise HTTPException(400, "NEWSAPI_KEY not set; use provider=rss or set the key.")
+        client = client or get_client()
 
         expanded = _expand_query(query)
         base = {
@@ -101,24 +196,21 @@ class NewsAPIProvider:
         if domains:   base["domains"] = domains
         if sources:   base["sources"] = sources  # NEW
 
-        # Pass 1: broad search in text fields
-        params1 = dict(q=expanded, searchIn="title,description,content", **base)
-        data1 = await self._call(client, params1)
-        items1 = self._project(data1)
-        if items1:
-            return items1[:limit]
-
-        # Pass 2: title-focused (strip parens so names match better)
         names_only = re.sub(r"[()]", "", expanded)
-        params2 = dict(qInTitle=names_only, **base)
-        data2 = await self._call(client, params2)
-        items2 = self._project(data2)
-        if items2:
-            return items2[:limit]
-
-        # Pass 3: broaden finance terms (still respects date/domains/sources)
         broader = f"{names_only} OR (earnings OR guidance OR upgrade OR downgrade OR outlook)"
-        params3 = dict(q=broader, **base)
-        data3 = await self._call(client, params3)
-        items3 = self._project(data3)
-        return items3[:limit]
\ No newline at end of file
+        passes = [
+            # Pass 1: broad search in text fields
+            dict(q=expanded, searchIn="title,description,content", **base),
+            # Pass 2: title-focused (strip parens so names match better)
+            dict(qInTitle=names_only, **base),
+            # Pass 3: broaden finance terms (still respects date/domains/sources)
+            dict(q=broader, **base),
+        ]
+        if self._parallel():
+            return await self._fetch_parallel(client, passes, limit)
+
+        for n, params in enumerate(passes, 1):
+            items = await self._run_pass(client, n, params, "sequential")
+            if items or n == len(passes):
+                return items[:limit]
+        return []
\ No newline at end of file
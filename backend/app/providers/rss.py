@@ -2,47 +2,171 @@
 from __future__ import annotations
 
 import re
+import time
+import asyncio
 import datetime as dt
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional, Sequence
+from urllib.parse import urlsplit
 
 import httpx
 import feedparser
+from prometheus_client import Counter, Histogram
 
 from app.services.normalize import strip_html, parse_rfc822_date
+from app.http_pool import get_client
+from app.timing import stage
+
+# Feed URL templates; "{q}" is replaced with the '+'-joined query
+DEFAULT_FEEDS: tuple[str, ...] = (
+    "https://news.google.com/rss/search?q={q}+when:7d+finance&hl=en-US&gl=US&ceid=US:en",
+    "https://feeds.finance.yahoo.com/rss/2.0/headline?s={q}&region=US&lang=en-US",
+)
+DEFAULT_FEED_TIMEOUT = 10.0
+# Entries kept per cached feed: the largest /api/search limit
+MAX_ITEMS = 50
+
+RSS_FEED_SECONDS = Histogram(
+    "rss_feed_fetch_seconds",
+    "Per-feed RSS fetch+parse latency",
+    ["feed", "outcome"],  # outcome: ok | error | timeout
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 10, 15),
+)
+
+RSS_FEED_CACHE = Counter(
+    "rss_feed_cache_total",
+    "Conditional-GET feed cache outcomes",
+    ["result"],  # not_modified | modified | miss
+)
+
+def _project_entry(e: Any, feed_title: str) -> dict[str, Any]:
+    title = strip_html(getattr(e, "title", "") or "")
+    link = getattr(e, "link", "") or ""
+    desc = strip_html(getattr(e, "summary", "") or getattr(e, "description", "") or "")
+    published = parse_rfc822_date(getattr(e, "published", None))
+    source = getattr(getattr(e, "source", {}), "title", "") or feed_title
+    return {
+        "title": title,
+        "url": link,
+        "description": desc,
+        "published_at": published,
+        "source": source,
+        "image_url": None,
+    }
+
+def _newest_first(item: dict[str, Any]) -> dt.datetime:
+    return item["published_at"] or dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+@dataclass
+class _ParsedFeed:
+    """One feed response: validators, parsed entries not yet projected, and projected items."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    entries: list
+    feed_title: str
+    items: list[dict[str, Any]] = field(default_factory=list)
+
+    def project(self, limit: int) -> list[dict[str, Any]]:
+        # Project lazily so a later, larger limit only pays for the extra entries
+        need = limit - len(self.items)
+        if need > 0 and self.entries:
+            self.items.extend(_project_entry(e, self.feed_title) for e in self.entries[:need])
+            del self.entries[:need]  # why: a projected entry is never read again
+        # why: cached items are shared by every request; callers get their own dicts
+        return [dict(it) for it in self.items[:limit]]
+
+class FeedCache:
+    """Per-worker LRU of feed URL -> last 200 response, for If-None-Match / If-Modified-Since."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, _ParsedFeed] = OrderedDict()
+
+    def get(self, url: str) -> Optional[_ParsedFeed]:
+        feed = self._data.get(url)
+        if feed is not None:
+            self._data.move_to_end(url)
+        return feed
+
+    def put(self, url: str, feed: _ParsedFeed) -> None:
+        if not (feed.etag or feed.last_modified):
+            self._data.pop(url, None)  # why: nothing to revalidate with
+            return
+        self._data[url] = feed
+        self._data.move_to_end(url)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
 
 class RSSProvider:
     name = "rss"
 
-    async def fetch(self, query: str, limit: int, client: httpx.AsyncClient, **kwargs) -> list[dict[str, Any]]:
-        q = re.sub(r"\s+", "+", query.strip())
-        feeds = [
-            f"https://news.google.com/rss/search?q={q}+when:7d+finance&hl=en-US&gl=US&ceid=US:en",
-            f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={q}&region=US&lang=en-US",
-        ]
-
-        items: list[dict[str, Any]] = []
-        for url in feeds:
-            try:
-                r = await client.get(url, timeout=10)
-                r.raise_for_status()
-            except Exception:
-                continue
+    def __init__(
+        self,
+        feeds: Sequence[str] | None = None,
+        timeout: float | None = None,
+        cache: FeedCache | None = None,
+    ):
+        self.feeds = tuple(feeds) if feeds else DEFAULT_FEEDS
+        self.timeout = timeout if timeout and timeout > 0 else DEFAULT_FEED_TIMEOUT
+        self.cache = cache
 
+    async def _fetch_feed(self, client: httpx.AsyncClient, url: str, limit: int) -> list[dict[str, Any]]:
+        feed = urlsplit(url).hostname or "unknown"  # why: host keeps label cardinality bounded
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            # Per-feed deadline covers connect, body and parse; slow feeds are dropped, not awaited
+            items = await asyncio.wait_for(self._fetch_and_parse(client, url, limit), timeout=self.timeout)
+            outcome = "ok"
+            return items
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            return []
+        except Exception:
+            return []
+        finally:
+            RSS_FEED_SECONDS.labels(feed, outcome).observe(time.perf_counter() - started)
+
+    async def _fetch_and_parse(self, client: httpx.AsyncClient, url: str, limit: int) -> list[dict[str, Any]]:
+        cached = self.cache.get(url) if self.cache is not None else None
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        r = await client.get(url, timeout=self.timeout, headers=headers or None)
+        if r.status_code == 304 and cached is not None:
+            RSS_FEED_CACHE.labels("not_modified").inc()
+            return cached.project(limit)  # why: skip download + feedparser.parse on unchanged feeds
+        r.raise_for_status()
+
+        with stage("parse", self.name):
             parsed = feedparser.parse(r.text)
-            for e in parsed.entries[:limit]:
-                title = strip_html(getattr(e, "title", "") or "")
-                link = getattr(e, "link", "") or ""
-                desc = strip_html(getattr(e, "summary", "") or getattr(e, "description", "") or "")
-                published = parse_rfc822_date(getattr(e, "published", None))
-                source = getattr(getattr(e, "source", {}), "title", "") or getattr(parsed.feed, "title", "RSS")
-                items.append({
-                    "title": title,
-                    "url": link,
-                    "description": desc,
-                    "published_at": published,
-                    "source": source,
-                    "image_url": None,
-                })
+        feed = _ParsedFeed(
+            etag=r.headers.get("etag"),
+            last_modified=r.headers.get("last-modified"),
+            entries=list(parsed.entries[:MAX_ITEMS]),
+            feed_title=getattr(parsed.feed, "title", "RSS"),
+        )
+        if self.cache is not None:
+            self.cache.put(url, feed)
+            RSS_FEED_CACHE.labels("modified" if cached is not None else "miss").inc()
+        return feed.project(limit)
+
+    def _feed_urls(self, query: str) -> list[str]:
+        q = re.sub(r"\s+", "+", query.strip())
+        return [tpl.replace("{q}", q) for tpl in self.feeds]
+
+    async def fetch(self, query: str, limit: int, client: httpx.AsyncClient | None = None, **kwargs) -> list[dict[str, Any]]:
+        client = client or get_client()
+        feeds = self._feed_urls(query)
+
+        # Fan out concurrently; results stay in feed-list order so dedupe precedence is stable
+        per_feed = await asyncio.gather(*(self._fetch_feed(client, url, limit) for url in feeds))
+        items: list[dict[str, Any]] = [it for batch in per_feed for it in batch]
 
         seen: set[str] = set()
         deduped: list[dict[str, Any]] = []
@@ -53,8 +177,39 @@ class RSSProvider:
             seen.add(key)
             deduped.append(it)
 
-        deduped.sort(
-            key=lambda x: x["published_at"] or dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc),
-            reverse=True,
-        )
-        return deduped[:limit]
\ No newline at end of file
+        deduped.sort(key=_newest_first, reverse=True)
+        return deduped[:limit]
+
+    async def stream(
+        self, query: str, limit: int, client: httpx.AsyncClient | None = None, **kwargs
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Yield one deduped, newest-first batch per feed as each feed completes.
+
+        Unlike fetch(), the first `limit` articles win in arrival order, so a fast
+        feed is never held back by a slow one.
+        """
+        client = client or get_client()
+        tasks = [asyncio.ensure_future(self._fetch_feed(client, url, limit)) for url in self._feed_urls(query)]
+        seen: set[str] = set()
+        remaining = limit
+        try:
+            for fut in asyncio.as_completed(tasks):
+                batch: list[dict[str, Any]] = []
+                for it in await fut:
+                    key = it["url"] or it["title"]
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    batch.append(it)
+                if not batch:
+                    continue
+                batch.sort(key=_newest_first, reverse=True)
+                batch = batch[:remaining]
+                remaining -= len(batch)
+                yield batch
+                if remaining <= 0:
+                    break
+        finally:
+            for t in tasks:
+                t.cancel()  # why: client went away or limit reached; don't finish unused feeds
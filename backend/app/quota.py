@@ -0,0 +1,180 @@
+# backend/app/quota.py
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import time
+from contextvars import ContextVar
+from typing import Literal, Optional
+
+from prometheus_client import Counter, Gauge
+
+Priority = Literal["interactive", "background"]
+
+# Who is asking: request handlers run as interactive; background tasks and bulk/diag
+# endpoints set "background" so they can't spend the share held back for users.
+quota_priority: ContextVar[Priority] = ContextVar("quota_priority", default="interactive")
+
+# outcome: granted | waited (granted after waiting for refill) | rejected (budget) | backoff (429 cooldown)
+QUOTA_DECISIONS = Counter(
+    "upstream_quota_decisions_total",
+    "Upstream quota governor decisions",
+    ["api", "priority", "outcome"],
+)
+QUOTA_REMAINING = Gauge("upstream_quota_remaining", "Tokens left in the shared upstream quota bucket", ["api"])
+QUOTA_BACKOFF = Gauge("upstream_quota_backoff_seconds", "Remaining cluster-wide backoff after an upstream 429", ["api"])
+UPSTREAM_RATE_LIMITED = Counter("upstream_rate_limited_total", "Upstream 429 responses", ["api"])
+
+# KEYS[1] = bucket hash, KEYS[2] = backoff key
+# ARGV = refill per ms, capacity, cost, reserve (tokens that must stay behind after this take)
+# -> {granted 0/1, tokens left (floor, -1 = no bucket), wait ms (backoff or refill)}
+_ACQUIRE_LUA = """
+local backoff = redis.call('pttl', KEYS[2])
+if backoff > 0 then
+  return {0, -1, backoff}
+end
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+if capacity <= 0 then
+  return {1, -1, 0}
+end
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = 0
+local wait = 0
+if tokens - cost >= reserve then
+  tokens = tokens - cost
+  granted = 1
+else
+  wait = math.ceil((cost + reserve - tokens) / rate)
+end
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil(capacity / rate) + 60000)
+return {granted, math.floor(tokens), wait}
+"""
+
+# Only ever lengthen the backoff (several workers may report the same 429)
+_BACKOFF_LUA = """
+if redis.call('pttl', KEYS[1]) < tonumber(ARGV[1]) then
+  redis.call('set', KEYS[1], '1', 'px', ARGV[1])
+end
+return redis.call('pttl', KEYS[1])
+"""
+
+
+class QuotaExhausted(Exception):
+    """No upstream budget for this call; retry_after is in seconds."""
+
+    def __init__(self, api: str, retry_after: float, reason: str) -> None:
+        super().__init__(f"{api} {reason}; retry in {retry_after:.0f}s")
+        self.api = api
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Retry-After as seconds (delta-seconds or HTTP date); default if missing or unparseable."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except Exception:
+        return default
+
+
+class QuotaGovernor:
+    """Cluster-wide token bucket for one upstream API, shared by all workers through Redis.
+
+    The bucket holds `capacity` tokens and refills `per_day` tokens a day; every
+    upstream request takes one. Background callers must leave `reserve` (a
+    fraction of capacity) behind, so interactive searches keep working when
+    bulk work drains the budget. Interactive callers wait up to `max_wait`
+    seconds for a refill. A 429 from upstream sets a shared backoff that every
+    worker honours before sending anything. Redis errors fail open; the local
+    copy of the backoff still applies.
+    """
+
+    def __init__(
+        self,
+        redis,
+        api: str,
+        *,
+        per_day: int = 0,
+        capacity: int = 0,
+        reserve: float = 0.2,
+        max_wait: float = 2.0,
+        default_backoff: float = 60.0,
+        prefix: str = "quota:",
+    ) -> None:
+        self.redis = redis
+        self.api = api
+        self.per_day = max(0, per_day)
+        self.capacity = max(0, capacity or per_day) if per_day else 0  # 0 = no budget, backoff only
+        self.reserve = max(0.0, min(reserve, 1.0))
+        self.max_wait = max(0.0, max_wait)
+        self.default_backoff = default_backoff
+        self._bucket_key = f"{prefix}{api}:bucket"
+        self._backoff_key = f"{prefix}{api}:backoff"
+        self._backoff_until = 0.0  # monotonic; saves a round trip while a backoff is known
+        self.remaining: Optional[int] = None  # tokens left as of the last acquire (None = unknown/unlimited)
+        QUOTA_BACKOFF.labels(api).set_function(lambda: max(0.0, self._backoff_until - time.monotonic()))
+
+    async def acquire(self, priority: Optional[Priority] = None, cost: int = 1) -> None:
+        """Take `cost` tokens or raise QuotaExhausted."""
+        priority = priority or quota_priority.get()
+        reserve = self.capacity * self.reserve if priority == "background" else 0.0
+        max_wait = self.max_wait if priority == "interactive" else 0.0
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            now = time.monotonic()
+            if self._backoff_until > now:
+                QUOTA_DECISIONS.labels(self.api, priority, "backoff").inc()
+                raise QuotaExhausted(self.api, self._backoff_until - now, "rate limited upstream")
+            try:
+                granted, left, wait_ms = await self.redis.eval(
+                    _ACQUIRE_LUA, 2, self._bucket_key, self._backoff_key,
+                    self.per_day / 86_400_000, self.capacity, cost, reserve,
+                )
+            except Exception:
+                QUOTA_DECISIONS.labels(self.api, priority, "granted").inc()
+                return  # why: fail open; a Redis outage shouldn't take NewsAPI down with it
+            granted, left, wait_ms = int(granted), int(left), int(wait_ms)
+            if left >= 0:
+                self.remaining = left
+                QUOTA_REMAINING.labels(self.api).set(left)
+            if granted:
+                QUOTA_DECISIONS.labels(self.api, priority, "waited" if waited else "granted").inc()
+                return
+            if left < 0:  # backoff set by another worker
+                self._backoff_until = time.monotonic() + wait_ms / 1000.0
+                QUOTA_DECISIONS.labels(self.api, priority, "backoff").inc()
+                raise QuotaExhausted(self.api, wait_ms / 1000.0, "rate limited upstream")
+            if time.monotonic() + wait_ms / 1000.0 > deadline:
+                QUOTA_DECISIONS.labels(self.api, priority, "rejected").inc()
+                raise QuotaExhausted(self.api, wait_ms / 1000.0, "quota exhausted")
+            waited = True
+            await asyncio.sleep(wait_ms / 1000.0)
+
+    async def backoff(self, retry_after: Optional[str] = None) -> float:
+        """Record an upstream 429: every worker pauses for Retry-After (or the default). Returns seconds."""
+        seconds = parse_retry_after(retry_after, self.default_backoff)
+        UPSTREAM_RATE_LIMITED.labels(self.api).inc()
+        self._backoff_until = max(self._backoff_until, time.monotonic() + seconds)
+        try:
+            pttl = int(await self.redis.eval(_BACKOFF_LUA, 1, self._backoff_key, max(1, int(seconds * 1000))))
+            seconds = max(seconds, pttl / 1000.0)
+        except Exception:
+            pass
+        print(f"[quota] {self.api} rate limited; backing off {seconds:.0f}s")
+        return seconds
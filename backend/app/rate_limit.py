@@ -0,0 +1,242 @@
+# backend/app/rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+import uuid
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+from limits import parse as parse_limit
+from prometheus_client import Counter, Histogram
+
+# outcome: allowed (Redis) | local (served from a leased allowance) | denied
+#          | error (Redis down; the check falls back to a per-worker window)
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions",
+    ["scope", "outcome"],
+)
+RATE_LIMIT_CHECK_SECONDS = Histogram(
+    "rate_limit_check_seconds",
+    "Rate limiter Redis round trip",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+
+# Sliding-window log: one ZSET member per admitted request, scored by Redis TIME (ms).
+# KEYS[1] = log; ARGV = window ms, limit, cost, member id
+# -> {admitted 0/1, slots left, retry-after ms}
+_SLIDING_WINDOW_LUA = """
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+redis.call('zremrangebyscore', KEYS[1], '-inf', now - window)
+local left = limit - redis.call('zcard', KEYS[1])
+if left < cost then
+  local oldest = redis.call('zrange', KEYS[1], 0, 0, 'withscores')
+  local retry = window
+  if oldest[2] then retry = tonumber(oldest[2]) + window - now end
+  return {0, left, retry}
+end
+for i = 1, cost do
+  redis.call('zadd', KEYS[1], now, ARGV[4] .. ':' .. i)
+end
+redis.call('pexpire', KEYS[1], window)
+return {1, left - cost, 0}
+"""
+
+# Log requests admitted from a local allowance (no check: they were already let through).
+# KEYS[1] = log; ARGV = window ms, cost, member id
+_CHARGE_LUA = """
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+for i = 1, tonumber(ARGV[2]) do
+  redis.call('zadd', KEYS[1], now, ARGV[3] .. ':' .. i)
+end
+redis.call('pexpire', KEYS[1], tonumber(ARGV[1]))
+return 1
+"""
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float  # seconds; 0 when allowed
+
+
+class RateLimiter:
+    """Redis sliding-window limiter shared by every worker (one Lua round trip per check).
+
+    The window is an exact log of admitted requests, so a limit of 5/second holds
+    across all workers rather than per process. To skip the Redis round trip for
+    clients that are clearly under their limit, a check that leaves more than
+    half the window free also grants a local allowance of up to `local_lease`
+    requests for `local_ttl` seconds (at most 5% of the window). Requests
+    admitted from it are logged in Redis in the background, so only real hits
+    count against the client; the price is that each worker may admit up to
+    `local_lease` requests the others can't see yet, and only while the window
+    is at least half empty. A denied client is answered locally until its
+    oldest slot leaves the window. If Redis is unreachable each worker falls
+    back to its own in-memory window, so limits still hold per process.
+    """
+
+    def __init__(
+        self,
+        redis,
+        key_func: Callable[[Request], str],
+        *,
+        default: str = "60/minute",
+        enabled: bool = True,
+        local_lease: int = 4,
+        local_ttl: float = 0.25,
+        prefix: str = "rl:",
+    ) -> None:
+        self.redis = redis
+        self.key_func = key_func
+        self.default = default
+        self.enabled = enabled
+        self.local_lease = max(0, local_lease)
+        self.local_ttl = max(0.0, local_ttl)
+        self.prefix = prefix
+        self._script = redis.register_script(_SLIDING_WINDOW_LUA)
+        self._charge_script = redis.register_script(_CHARGE_LUA)
+        self._local: dict[str, tuple[float, int]] = {}  # key -> (expires at, local allowance left)
+        self._charges: set[asyncio.Task] = set()
+        self._denied: dict[str, float] = {}  # key -> when its oldest slot leaves the window
+        self._fallback: dict[str, deque[float]] = {}  # key -> admit times while Redis is down
+        self._seq = 0
+        self._id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def _take_local(self, key: str, cost: int) -> bool:
+        hit = self._local.get(key)
+        if hit is None:
+            return False
+        expires, left = hit
+        if expires <= time.monotonic() or left < cost:
+            self._local.pop(key, None)
+            return False
+        self._local[key] = (expires, left - cost)
+        return True
+
+    async def _charge(self, key: str, window_ms: int, cost: int) -> None:
+        self._seq += 1
+        try:
+            await self._charge_script(keys=[key], args=[window_ms, cost, f"{self._id}:{self._seq}"])
+        except Exception:
+            RATE_LIMIT_DECISIONS.labels("charge", "error").inc()
+
+    def _charge_later(self, key: str, window_ms: int, cost: int) -> None:
+        task = asyncio.get_running_loop().create_task(self._charge(key, window_ms, cost))
+        self._charges.add(task)  # why: keep a reference until the write lands
+        task.add_done_callback(self._charges.discard)
+
+    def _hit_fallback(self, key: str, amount: int, window: float, cost: int) -> Decision:
+        """Per-worker sliding window used while Redis is unreachable."""
+        now = time.monotonic()
+        if len(self._fallback) > 10000:
+            self._fallback = {k: v for k, v in self._fallback.items() if v and v[-1] > now - window}
+        log = self._fallback.setdefault(key, deque())
+        while log and log[0] <= now - window:
+            log.popleft()
+        left = amount - len(log)
+        if left < cost:
+            return Decision(False, max(0, left), max(0.001, log[0] + window - now if log else window))
+        log.extend([now] * cost)
+        return Decision(True, left - cost, 0.0)
+
+    async def hit(self, key: str, rate: str, scope: str = "default", cost: int = 1) -> Decision:
+        """Count `cost` requests for `key` against `rate` (e.g. "5/second")."""
+        item = parse_limit(rate)
+        full_key = f"{self.prefix}{scope}:{item.amount}/{item.get_expiry()}:{key}"
+        window_ms = item.get_expiry() * 1000
+        if self._take_local(full_key, cost):
+            self._charge_later(full_key, window_ms, cost)
+            RATE_LIMIT_DECISIONS.labels(scope, "local").inc()
+            return Decision(True, 0, 0.0)
+        blocked_until = self._denied.get(full_key)
+        if blocked_until is not None:
+            wait = blocked_until - time.monotonic()
+            if wait > 0:  # why: no slot can free up before then, so Redis would say no as well
+                RATE_LIMIT_DECISIONS.labels(scope, "denied").inc()
+                return Decision(False, 0, wait)
+            del self._denied[full_key]
+
+        self._seq += 1
+        started = time.perf_counter()
+        try:
+            admitted, left, retry_ms = await self._script(
+                keys=[full_key], args=[window_ms, item.amount, cost, f"{self._id}:{self._seq}"],
+            )
+        except Exception:
+            RATE_LIMIT_DECISIONS.labels(scope, "error").inc()
+            decision = self._hit_fallback(full_key, item.amount, item.get_expiry(), cost)
+            if not decision.allowed:
+                RATE_LIMIT_DECISIONS.labels(scope, "denied").inc()
+            return decision
+        finally:
+            RATE_LIMIT_CHECK_SECONDS.observe(time.perf_counter() - started)
+
+        admitted, left = int(admitted), int(left)
+        if self._fallback:
+            self._fallback.clear()  # why: Redis is back; its log is authoritative again
+        if len(self._local) + len(self._denied) > 10000:
+            now = time.monotonic()
+            self._local = {k: v for k, v in self._local.items() if v[0] > now}
+            self._denied = {k: v for k, v in self._denied.items() if v > now}
+        if not admitted:
+            RATE_LIMIT_DECISIONS.labels(scope, "denied").inc()
+            retry_after = max(0.001, int(retry_ms) / 1000.0)
+            if cost == 1:
+                self._denied[full_key] = time.monotonic() + retry_after
+            return Decision(False, max(0, left), retry_after)
+        # why: a short allowance keeps unlogged admits a small share of the window
+        ttl = min(self.local_ttl, item.get_expiry() * 0.05)
+        allowance = min(self.local_lease, left - item.amount // 2)
+        if ttl > 0 and allowance > 0:
+            self._local[full_key] = (time.monotonic() + ttl, allowance)
+        RATE_LIMIT_DECISIONS.labels(scope, "allowed").inc()
+        return Decision(True, left, 0.0)
+
+    async def check(self, request: Request, rate: Optional[str] = None, scope: Optional[str] = None,
+                    cost: int = 1) -> None:
+        """Raise 429 (with Retry-After) if this request's caller is over `rate`."""
+        if not self.enabled:
+            return
+        if scope is None:
+            route = request.scope.get("route")
+            scope = getattr(route, "path", None) or "default"
+        decision = await self.hit(self.key_func(request), rate or self.default, scope, cost)
+        if not decision.allowed:
+            raise HTTPException(
+                429, "Too Many Requests",
+                headers={"Retry-After": str(math.ceil(decision.retry_after)), "X-RateLimit-Remaining": "0"},
+            )
+
+    def limit(self, rate: str, scope: Optional[str] = None):
+        """Route dependency enforcing `rate` instead of the default limit."""
+        async def _limit(request: Request) -> None:
+            await self.check(request, rate, scope)
+
+        _limit.rate_limit = rate  # type: ignore[attr-defined]  # tells default_limit to stand down
+        return _limit
+
+    def checked_in_handler(self, rate: str):
+        """Route dependency for routes that call check() themselves: no-op, but the default limit stands down."""
+        async def _checked() -> None:
+            return None
+
+        _checked.rate_limit = rate  # type: ignore[attr-defined]
+        return _checked
+
+    async def default_limit(self, request: Request) -> None:
+        """App-wide dependency: the default limit, counted per route, for routes without their own limit()."""
+        route = request.scope.get("route")
+        for dep in getattr(route, "dependencies", None) or ():
+            if getattr(dep.dependency, "rate_limit", None):
+                return
+        await self.check(request, self.default)  # why: scope=None -> the route path, one bucket per route
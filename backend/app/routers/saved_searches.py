@@ -1,13 +1,18 @@
 # ===================== backend/app/routers/saved_searches.py ====================
 from __future__ import annotations
+import base64
+import datetime as dt
+import json
 from typing import Optional, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, Response, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, select, desc, asc
+from sqlalchemy import select, desc, asc, literal, tuple_
 
-from app.db import get_db, create_all
+from app.db import ASYNC_ENABLED, get_db, get_async_db, get_engine, create_all
+from app.name_search import Match, apply_name_filter, ensure_name_index
 from app.models_db import SavedSearch, SavedSearchIn, SavedSearchOut, SavedSearchPage
 
 router = APIRouter(prefix="/api", tags=["saved-searches"])
@@ -15,38 +20,77 @@ router = APIRouter(prefix="/api", tags=["saved-searches"])
 @router.on_event("startup")
 def ensure_tables() -> None:
     create_all()
+    if get_engine() is not None:
+        ensure_name_index(get_engine())
 
-@router.get("/saved", response_model=SavedSearchPage)
-def list_saved(
-    q: Optional[str] = Query(None, description="Filter by name (case-insensitive)"),
-    limit: int = Query(20, ge=1, le=100),
-    cursor: Optional[int] = Query(None, description="Keyset by id: id <cursor (desc) or >cursor (asc)"),
-    order: Literal["id", "created_at"] = Query("id"),
-    dir:   Literal["desc", "asc"] = Query("desc"),
-    db: Session = Depends(get_db),
-) -> SavedSearchPage:
-    # Keyset uses id; order is for presentation
-    stmt = select(SavedSearch)
+# Keyset position: (created_at, id) for order=created_at, (None, id) for order=id
+_Key = tuple[Optional[dt.datetime], int]
 
-    if q:
-        stmt = stmt.where(func.lower(SavedSearch.name).like(f"%{q.lower()}%"))
+def _encode_cursor(row: SavedSearch, order: str, dir: str) -> str:
+    ts = row.created_at.isoformat() if order == "created_at" else None
+    raw = json.dumps([order, dir, ts, row.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
 
-    if cursor is not None:
-        stmt = stmt.where(SavedSearch.id < cursor) if dir == "desc" else stmt.where(SavedSearch.id > cursor)
+def _decode_cursor(cursor: Optional[str], order: str, dir: str) -> Optional[_Key]:
+    """Opaque cursor -> keyset position; 400 if malformed or minted for another order/dir."""
+    if not cursor:
+        return None
+    if cursor.isdigit() and order == "id":
+        return None, int(cursor)  # why: plain id cursors from older clients
+    try:
+        c_order, c_dir, ts, last_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key = (dt.datetime.fromisoformat(ts) if ts else None, int(last_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (c_order, c_dir) != (order, dir) or (order == "created_at" and key[0] is None):
+        raise HTTPException(status_code=400, detail="Cursor does not match order/dir")
+    return key
 
-    col = SavedSearch.id if order == "id" else SavedSearch.created_at
-    primary = desc(col) if dir == "desc" else asc(col)
-    tie = desc(SavedSearch.id) if dir == "desc" else asc(SavedSearch.id)
+def _list_stmt(q: Optional[str], match: str, limit: int, key: Optional[_Key], order: str, dir: str):
+    # Keyset on the full sort key, so each page is an index range scan
+    stmt = select(SavedSearch)
 
-    stmt = stmt.order_by(primary, tie).limit(limit + 1)
+    if q and q.strip():
+        keyset = (key[1] if key else None, dir) if order == "id" else None
+        stmt, ranked = apply_name_filter(stmt, q, match, limit + 1, keyset)  # type: ignore[arg-type]
+        if ranked:
+            return stmt  # why: relevance order has no keyset; first page only
 
-    rows = list(db.execute(stmt).scalars())
+    if order == "id":
+        if key is not None:
+            stmt = stmt.where(SavedSearch.id < key[1]) if dir == "desc" else stmt.where(SavedSearch.id > key[1])
+        sort = (SavedSearch.id,)
+    else:
+        sort_key = tuple_(SavedSearch.created_at, SavedSearch.id)
+        if key is not None:
+            bound = tuple_(literal(key[0], SavedSearch.created_at.type), literal(key[1]))
+            stmt = stmt.where(sort_key < bound) if dir == "desc" else stmt.where(sort_key > bound)
+        sort = (SavedSearch.created_at, SavedSearch.id)
+
+    # One extra row tells us whether another page exists (no separate EXISTS round trip)
+    return stmt.order_by(*(desc(c) if dir == "desc" else asc(c) for c in sort)).limit(limit + 1)
+
+def _page(rows: list[SavedSearch], limit: int, order: str, dir: str, keyset: bool = True) -> SavedSearchPage:
     has_more = len(rows) > limit
     items = rows[:limit]
-    next_cursor = items[-1].id if (has_more and items) else None
-    return SavedSearchPage(items=items, next_cursor=next_cursor)
+    next_cursor = _encode_cursor(items[-1], order, dir) if (has_more and items and keyset) else None
+    return SavedSearchPage(items=items, next_cursor=next_cursor, has_more=has_more)
+
+_DUPLICATE = "A saved search with this name already exists."
+
+# ---------- sync handlers (threadpool) ----------
+def list_saved(
+    q: Optional[str] = Query(None, description="Filter by name (case-insensitive)"),
+    match: Match = Query("contains", description="contains | prefix | ranked (relevance order, no cursor)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (same order/dir)"),
+    order: Literal["id", "created_at"] = Query("id"),
+    dir:   Literal["desc", "asc"] = Query("desc"),
+    db: Session = Depends(get_db),
+) -> SavedSearchPage:
+    rows = list(db.execute(_list_stmt(q, match, limit, _decode_cursor(cursor, order, dir), order, dir)).scalars())
+    return _page(rows, limit, order, dir, keyset=not (q and q.strip() and match == "ranked"))
 
-@router.post("/saved", response_model=SavedSearchOut, status_code=status.HTTP_201_CREATED)
 def create_saved(payload: SavedSearchIn, db: Session = Depends(get_db)) -> SavedSearch:
     row = SavedSearch(name=payload.name, params=payload.params)
     db.add(row)
@@ -54,15 +98,71 @@ def create_saved(payload: SavedSearchIn, db: Session = Depends(get_db)) -> Saved
         db.commit()
     except IntegrityError:
         db.rollback()
-        raise HTTPException(status_code=409, detail="A saved search with this name already exists.")
+        raise HTTPException(status_code=409, detail=_DUPLICATE)
     db.refresh(row)
     return row
 
-@router.delete("/saved/{saved_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
-def delete_saved(saved_id: int, db: Session = Depends(get_db)) -> Response:
+def _refresher(request: Request):
+    return getattr(request.app.state, "saved_refresher", None)
+
+def delete_saved(
+    saved_id: int, request: Request, background: BackgroundTasks, db: Session = Depends(get_db),
+) -> Response:
     row = db.get(SavedSearch, saved_id)
     if not row:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(row)
     db.commit()
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    refresher = _refresher(request)
+    if refresher is not None:
+        background.add_task(refresher.forget_result, saved_id)  # why: async Redis; runs on the loop after the response
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# ---------- async handlers (event loop; DB_ASYNC=1) ----------
+async def list_saved_async(
+    q: Optional[str] = Query(None, description="Filter by name (case-insensitive)"),
+    match: Match = Query("contains", description="contains | prefix | ranked (relevance order, no cursor)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from the previous page (same order/dir)"),
+    order: Literal["id", "created_at"] = Query("id"),
+    dir:   Literal["desc", "asc"] = Query("desc"),
+    db: AsyncSession = Depends(get_async_db),
+) -> SavedSearchPage:
+    rows = list((await db.execute(_list_stmt(q, match, limit, _decode_cursor(cursor, order, dir), order, dir))).scalars())
+    return _page(rows, limit, order, dir, keyset=not (q and q.strip() and match == "ranked"))
+
+async def create_saved_async(payload: SavedSearchIn, db: AsyncSession = Depends(get_async_db)) -> SavedSearch:
+    row = SavedSearch(name=payload.name, params=payload.params)
+    db.add(row)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=_DUPLICATE)
+    await db.refresh(row)
+    return row
+
+async def delete_saved_async(saved_id: int, request: Request, db: AsyncSession = Depends(get_async_db)) -> Response:
+    row = await db.get(SavedSearch, saved_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Not found")
+    await db.delete(row)
+    await db.commit()
+    refresher = _refresher(request)
+    if refresher is not None:
+        await refresher.forget_result(saved_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# Same paths either way; DB_ASYNC picks the implementation at import time
+router.add_api_route(
+    "/saved", list_saved_async if ASYNC_ENABLED else list_saved,
+    methods=["GET"], response_model=SavedSearchPage,
+)
+router.add_api_route(
+    "/saved", create_saved_async if ASYNC_ENABLED else create_saved,
+    methods=["POST"], response_model=SavedSearchOut, status_code=status.HTTP_201_CREATED,
+)
+router.add_api_route(
+    "/saved/{saved_id}", delete_saved_async if ASYNC_ENABLED else delete_saved,
+    methods=["DELETE"], status_code=status.HTTP_204_NO_CONTENT, response_class=Response,
+)
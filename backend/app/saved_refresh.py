@@ -0,0 +1,188 @@
+# backend/app/saved_refresh.py
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import os
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import select
+
+from app.db import get_db
+from app.models_db import SavedSearch
+
+SAVED_REFRESH_RUNS = Counter(
+    "saved_refresh_runs_total",
+    "Background saved-search refreshes",
+    ["outcome"],  # ok | error | invalid
+)
+SAVED_REFRESH_LEADER = Gauge("saved_refresh_leader", "1 if this worker holds the refresh leader lease")
+SAVED_REFRESH_LAST_CYCLE = Gauge("saved_refresh_last_cycle_seconds", "Duration of the last refresh cycle")
+
+# Extend the lease only if we still own it
+_RENEW_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Runner: saved params -> (SearchResponse JSON, count), or None if the params are unusable
+Runner = Callable[[dict[str, Any]], Awaitable[Optional[tuple[str, int]]]]
+
+
+def _load_saved(max_rows: int) -> list[tuple[int, dict[str, Any]]]:
+    gen = get_db()
+    db = next(gen)
+    try:
+        stmt = select(SavedSearch.id, SavedSearch.params).order_by(SavedSearch.id).limit(max_rows)
+        return [(row.id, row.params or {}) for row in db.execute(stmt)]
+    finally:
+        gen.close()
+
+
+def load_saved_many(ids: Optional[list[int]], max_rows: int) -> list[tuple[int, dict[str, Any]]]:
+    """(id, params) for the given ids (all saved searches if None); missing ids are left out."""
+    if ids is None:
+        return _load_saved(max_rows)
+    gen = get_db()
+    db = next(gen)
+    try:
+        stmt = select(SavedSearch.id, SavedSearch.params).where(SavedSearch.id.in_(ids[:max_rows]))
+        return [(row.id, row.params or {}) for row in db.execute(stmt)]
+    finally:
+        gen.close()
+
+
+def load_saved_params(saved_id: int) -> Optional[dict[str, Any]]:
+    gen = get_db()
+    db = next(gen)
+    try:
+        row = db.get(SavedSearch, saved_id)
+        return (row.params or {}) if row else None
+    finally:
+        gen.close()
+
+
+class SavedSearchRefresher:
+    """Periodically re-runs saved searches and stores their enriched results in Redis.
+
+    Exactly one gunicorn worker leads at a time (renewed Redis lease). Each cycle
+    spreads searches over a random jitter window and runs at most `concurrency`
+    of them at once. Results live under `{prefix}result:{id}` for 3 intervals.
+    """
+
+    def __init__(
+        self,
+        redis,
+        runner: Runner,
+        *,
+        interval: float = 300.0,
+        concurrency: int = 4,
+        jitter: float = 60.0,
+        lease_ms: int = 30000,
+        max_searches: int = 500,
+        prefix: str = "saved_refresh:",
+    ) -> None:
+        self.redis = redis
+        self.runner = runner
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.jitter = max(0.0, min(jitter, interval))
+        self.lease_ms = lease_ms
+        self.max_searches = max_searches
+        self.prefix = prefix
+        self._token = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._cycle: Optional[asyncio.Task] = None
+        self._next_cycle = 0.0
+
+    def result_key(self, saved_id: int) -> str:
+        return f"{self.prefix}result:{saved_id}"
+
+    async def get_result(self, saved_id: int) -> Optional[dict[str, Any]]:
+        """Stored {"refreshed_at": iso, "body": SearchResponse JSON} or None."""
+        try:
+            raw = await self.redis.get(self.result_key(saved_id))
+            return json.loads(raw) if raw else None
+        except Exception:
+            return None
+
+    async def store_result(self, saved_id: int, body: str) -> str:
+        refreshed_at = dt.datetime.now(dt.timezone.utc).isoformat()
+        env = json.dumps({"refreshed_at": refreshed_at, "body": body}, separators=(",", ":"))
+        try:
+            await self.redis.set(self.result_key(saved_id), env, ex=int(self.interval * 3))
+        except Exception:
+            pass
+        return refreshed_at
+
+    async def forget_result(self, saved_id: int) -> None:
+        """Drop the stored result (the saved search was deleted)."""
+        try:
+            await self.redis.delete(self.result_key(saved_id))
+        except Exception:
+            pass
+
+    async def _is_leader(self) -> bool:
+        key = f"{self.prefix}leader"
+        if await self.redis.set(key, self._token, nx=True, px=self.lease_ms):
+            return True
+        return bool(await self.redis.eval(_RENEW_LUA, 1, key, self._token, self.lease_ms))
+
+    async def _refresh_one(self, sem: asyncio.Semaphore, saved_id: int, params: dict[str, Any]) -> None:
+        if self.jitter:
+            await asyncio.sleep(random.uniform(0, self.jitter))  # why: avoid a thundering herd upstream
+        async with sem:
+            try:
+                got = await self.runner(params)
+            except Exception as e:
+                SAVED_REFRESH_RUNS.labels("error").inc()
+                print(f"[saved-refresh] id={saved_id} failed: {e}")
+                return
+        if got is None:
+            SAVED_REFRESH_RUNS.labels("invalid").inc()
+            return
+        await self.store_result(saved_id, got[0])
+        SAVED_REFRESH_RUNS.labels("ok").inc()
+
+    async def _run_cycle(self) -> None:
+        started = time.perf_counter()
+        try:
+            rows = await asyncio.to_thread(_load_saved, self.max_searches)
+        except Exception as e:
+            print(f"[saved-refresh] could not load saved searches: {e}")
+            return
+        sem = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._refresh_one(sem, sid, params) for sid, params in rows))
+        SAVED_REFRESH_LAST_CYCLE.set(time.perf_counter() - started)
+        print(f"[saved-refresh] cycle done: {len(rows)} searches in {time.perf_counter() - started:.1f}s")
+
+    async def run_forever(self) -> None:
+        heartbeat = max(1.0, self.lease_ms / 3000.0)
+        while True:
+            try:
+                leader = await self._is_leader()
+                SAVED_REFRESH_LEADER.set(1 if leader else 0)
+                if leader:
+                    now = time.monotonic()
+                    if now >= self._next_cycle and (self._cycle is None or self._cycle.done()):
+                        self._next_cycle = now + self.interval
+                        self._cycle = asyncio.create_task(self._run_cycle())
+                elif self._cycle is not None and not self._cycle.done():
+                    self._cycle.cancel()  # why: lost the lease; another worker takes over
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                SAVED_REFRESH_LEADER.set(0)
+                print(f"[saved-refresh] leader check failed: {e}")
+            try:
+                await asyncio.sleep(heartbeat)
+            except asyncio.CancelledError:
+                break
+        if self._cycle is not None:
+            self._cycle.cancel()
@@ -0,0 +1,105 @@
+# backend/app/search_batch.py
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from prometheus_client import Counter
+
+from app.services.analysis import summarize_articles
+from app.services.sentiment import sentiment_from_tokens_batch
+
+# outcome: fetched = went upstream; shared = served from another search's fetch in the same batch
+BATCH_UPSTREAM_FETCHES = Counter(
+    "search_batch_upstream_fetches_total",
+    "Upstream fetches made by batch search runs",
+    ["outcome"],
+)
+
+
+def _fetch_key(provider: str, query: str, opts: dict[str, Any]) -> tuple:
+    return provider, " ".join(query.lower().split()), tuple(sorted((k, v) for k, v in opts.items() if v))
+
+
+class SharedFetch:
+    """Per-batch memo of upstream fetches.
+
+    Searches in one batch that differ only in limit or summary length share a
+    single provider.fetch(), made with the largest limit any of them asked for
+    (register them with want() first); each gets the newest-first prefix it
+    asked for. Results are never kept beyond the batch.
+    """
+
+    def __init__(self) -> None:
+        self._limits: dict[tuple, int] = {}
+        self._tasks: dict[tuple, asyncio.Task] = {}
+
+    def want(self, provider: str, query: str, limit: int, opts: Optional[dict[str, Any]] = None) -> None:
+        key = _fetch_key(provider, query, opts or {})
+        self._limits[key] = max(limit, self._limits.get(key, 0))
+
+    def wrap(self, impl: Any, provider: str) -> "_SharedProvider":
+        return _SharedProvider(self, impl, provider)
+
+    async def fetch(self, impl: Any, provider: str, query: str, limit: int, opts: dict[str, Any]) -> list[dict]:
+        key = _fetch_key(provider, query, opts)
+        task = self._tasks.get(key)
+        if task is None:
+            n = max(limit, self._limits.get(key, 0))
+            task = self._tasks[key] = asyncio.ensure_future(impl.fetch(query, n, **opts))
+            BATCH_UPSTREAM_FETCHES.labels("fetched").inc()
+        else:
+            BATCH_UPSTREAM_FETCHES.labels("shared").inc()
+        # why: shield so one caller's cancellation doesn't fail the others waiting on this fetch
+        return list((await asyncio.shield(task))[:limit])
+
+    def close(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # why: mark retrieved so failed fetches don't warn at GC
+
+
+class _SharedProvider:
+    """Provider facade whose fetch() goes through a SharedFetch."""
+
+    def __init__(self, shared: SharedFetch, impl: Any, provider: str) -> None:
+        self._shared = shared
+        self._impl = impl
+        self._provider = provider
+
+    async def fetch(self, query: str, limit: int, **opts: Any) -> list[dict]:
+        return await self._shared.fetch(self._impl, self._provider, query, limit, opts)
+
+
+def enrich_many(batches: list[tuple[list[dict], int]]) -> list[list[tuple[str, float]]]:
+    """
+    (summary, sentiment) per article for many (raw articles, summarize_sentences)
+    batches in one pass: an identical article that shows up in several batches
+    with the same sentence count is summarized once, and all sentiment scoring is one
+    vectorized call.
+    """
+    slots: dict[tuple, int] = {}
+    by_sentences: dict[int, list[dict]] = {}
+    refs: list[list[tuple[int, int]]] = []
+    for raw, sentences in batches:
+        ref = []
+        for it in raw:
+            key = (it.get("url"), it.get("title"), it.get("description"), sentences)
+            if key not in slots:
+                pending = by_sentences.setdefault(sentences, [])
+                slots[key] = len(pending)
+                pending.append(it)
+            ref.append((sentences, slots[key]))
+        refs.append(ref)
+
+    summaries: dict[int, list[str]] = {}
+    docs: list[list[str]] = []
+    offsets: dict[int, int] = {}
+    for sentences, items in by_sentences.items():
+        summaries[sentences], toks = summarize_articles(items, max_sentences=sentences)
+        offsets[sentences] = len(docs)
+        docs.extend(toks)
+    scores = sentiment_from_tokens_batch(docs)
+    return [[(summaries[s][i], scores[offsets[s] + i]) for s, i in ref] for ref in refs]
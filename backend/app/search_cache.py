@@ -0,0 +1,140 @@
+# backend/app/search_cache.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Literal, NamedTuple, Optional
+
+from prometheus_client import Counter
+
+SEARCH_CACHE_REQUESTS = Counter(
+    "search_cache_requests_total",
+    "/api/search response cache lookups",
+    ["result"],  # hit | stale | miss | bypass | error
+)
+SEARCH_CACHE_REFRESHES = Counter(
+    "search_cache_refreshes_total",
+    "Background stale-while-revalidate refreshes",
+    ["outcome"],  # ok | error | skipped
+)
+
+CacheState = Literal["hit", "stale", "miss"]
+
+
+class CacheEntry(NamedTuple):
+    body: Optional[str]   # serialized SearchResponse JSON
+    count: int
+    state: CacheState
+
+
+def _split_csv(s: Optional[str]) -> Optional[list[str]]:
+    vals = sorted({v.strip().lower() for v in (s or "").split(",") if v.strip()})
+    return vals or None
+
+
+def make_key(
+    *,
+    query: str,
+    provider: str,
+    limit: int,
+    summarize_sentences: int,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    domains: Optional[str] = None,
+    sources: Optional[str] = None,
+    prefix: str = "search:v1:",
+) -> str:
+    """Stable cache key for a normalized /api/search parameter set."""
+    params: dict[str, Any] = {
+        "q": " ".join(query.split()),
+        "p": provider,
+        "l": limit,
+        "s": summarize_sentences,
+    }
+    if provider != "rss":  # why: rss ignores these, so don't fragment its keys
+        params.update(df=date_from, dt=date_to, d=_split_csv(domains), src=_split_csv(sources))
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+    return prefix + digest
+
+
+class SearchCache:
+    """Redis response cache with a stale-while-revalidate window.
+
+    Entries live in Redis for ttl + swr seconds. Younger than ttl they are
+    served as-is; inside the swr window they are served immediately and one
+    worker (guarded by a short NX lock) recomputes them in the background.
+    """
+
+    def __init__(self, redis, ttl: int, swr: int, refresh_lock_seconds: int = 30) -> None:
+        self.redis = redis
+        self.ttl = max(0, ttl)
+        self.swr = max(0, swr)
+        self.refresh_lock_seconds = refresh_lock_seconds
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def get(self, key: str) -> CacheEntry:
+        try:
+            raw = await self.redis.get(key)
+        except Exception:
+            SEARCH_CACHE_REQUESTS.labels("error").inc()
+            return CacheEntry(None, 0, "miss")
+        if not raw:
+            SEARCH_CACHE_REQUESTS.labels("miss").inc()
+            return CacheEntry(None, 0, "miss")
+        try:
+            env = json.loads(raw)
+            age = time.time() - float(env["t"])
+            body, count = env["b"], int(env["n"])
+        except Exception:
+            SEARCH_CACHE_REQUESTS.labels("error").inc()
+            return CacheEntry(None, 0, "miss")
+
+        if age < self.ttl:
+            SEARCH_CACHE_REQUESTS.labels("hit").inc()
+            return CacheEntry(body, count, "hit")
+        if age < self.ttl + self.swr:
+            SEARCH_CACHE_REQUESTS.labels("stale").inc()
+            return CacheEntry(body, count, "stale")
+        SEARCH_CACHE_REQUESTS.labels("miss").inc()
+        return CacheEntry(None, 0, "miss")
+
+    async def set(self, key: str, body: str, count: int) -> None:
+        env = json.dumps({"t": time.time(), "n": count, "b": body}, separators=(",", ":"))
+        try:
+            await self.redis.set(key, env, ex=self.ttl + self.swr)
+        except Exception:
+            pass  # why: cache writes are best-effort
+
+    def refresh_in_background(self, key: str, compute: Callable[[], Awaitable[tuple[str, int]]]) -> None:
+        """Recompute a stale entry without blocking the caller; one refresher per key cluster-wide."""
+
+        async def _run() -> None:
+            try:
+                got_lock = await self.redis.set(f"{key}:refresh", "1", nx=True, ex=self.refresh_lock_seconds)
+            except Exception:
+                got_lock = False
+            if not got_lock:
+                SEARCH_CACHE_REFRESHES.labels("skipped").inc()
+                return
+            try:
+                body, count = await compute()
+                await self.set(key, body, count)
+                SEARCH_CACHE_REFRESHES.labels("ok").inc()
+            except Exception as e:
+                SEARCH_CACHE_REFRESHES.labels("error").inc()
+                print(f"[cache] refresh failed for {key}: {e}")
+            finally:
+                try:
+                    await self.redis.delete(f"{key}:refresh")
+                except Exception:
+                    pass
+
+        task = asyncio.create_task(_run())
+        self._tasks.add(task)  # why: keep a strong ref so the task isn't GC'd mid-flight
+        task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,37 @@
+# backend/app/services/analysis.py
+from __future__ import annotations
+from typing import Any, Iterable, NamedTuple
+
+from .normalize import WORD_RE
+from .summarizer import extract_summary
+from .sentiment import sentiment_from_tokens_batch
+
+class Enrichment(NamedTuple):
+    summary: str
+    sentiment: float
+
+def summarize_articles(items: Iterable[dict[str, Any]], max_sentences: int = 3) -> tuple[list[str], list[list[str]]]:
+    """
+    Summaries plus, per article, the tokens of f"{title} {summary}" for sentiment.
+    The summary's tokens come from the same pass that built the summary.
+    """
+    summaries: list[str] = []
+    docs: list[list[str]] = []
+    for it in items:
+        base_text = it.get("description") or ""
+        summ, summ_toks = extract_summary(base_text, max_sentences) if base_text else ("", [])
+        summaries.append(summ)
+        # Tokens of f"{title} {summ}" == title tokens + summary tokens (the space separates them)
+        docs.append(WORD_RE.findall(f"{it.get('title', '')}") + summ_toks)
+    return summaries, docs
+
+def enrich_articles(items: Iterable[dict[str, Any]], max_sentences: int = 3) -> list[Enrichment]:
+    """
+    One analysis pass per article for /api/search enrichment.
+
+    Equivalent to summarize(description) + quick_sentiment(f"{title} {summary}"),
+    but the summary's tokens are produced once and reused for sentiment, and all
+    articles are scored in a single batch.
+    """
+    summaries, docs = summarize_articles(items, max_sentences)
+    return [Enrichment(s, v) for s, v in zip(summaries, sentiment_from_tokens_batch(docs))]
@@ -0,0 +1,222 @@
+# backend/app/services/article_index.py
+from __future__ import annotations
+import asyncio
+import datetime as dt
+import fcntl
+import gzip
+import heapq
+import json
+import math
+import os
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .normalize import WORD_RE
+
+# BM25 knobs (standard defaults); title terms count double (BM25F-lite)
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+
+def tokenize(text: str) -> list[str]:
+    return WORD_RE.findall((text or "").lower())
+
+def _doc_terms(title: str, description: str) -> dict[str, int]:
+    tf: dict[str, int] = {}
+    for w in tokenize(title):
+        tf[w] = tf.get(w, 0) + TITLE_WEIGHT
+    for w in tokenize(description):
+        tf[w] = tf.get(w, 0) + 1
+    return tf
+
+def _to_iso(v: Any) -> Optional[str]:
+    if isinstance(v, dt.datetime):
+        return v.isoformat()
+    return v or None
+
+def _from_iso(v: Optional[str]) -> Optional[dt.datetime]:
+    if not v:
+        return None
+    try:
+        d = dt.datetime.fromisoformat(v)
+        return d if d.tzinfo else d.replace(tzinfo=dt.timezone.utc)
+    except Exception:
+        return None
+
+class ArticleIndex:
+    """
+    In-memory inverted index over provider articles, ranked with BM25.
+
+    Bounded to max_docs (oldest-inserted evicted first). Articles are keyed by
+    URL (title if missing); re-adding one replaces it. sync() merges with and
+    rewrites a gzip JSON snapshot (file-locked), so gunicorn workers share what
+    each of them has seen and restarts keep the index.
+    """
+
+    def __init__(self, max_docs: int = 20000, path: str = "") -> None:
+        self.max_docs = max(1, max_docs)
+        self.path = path
+        self._docs: OrderedDict[str, dict[str, Any]] = OrderedDict()   # key -> article (published_at as datetime)
+        self._tf: dict[str, dict[str, int]] = {}                       # key -> term frequencies
+        self._len: dict[str, int] = {}                                 # key -> weighted doc length
+        self._postings: dict[str, dict[str, int]] = {}                 # term -> {key: tf}
+        self._total_len = 0
+        self._dirty = False
+        self._disk_mtime = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ---------- updates ----------
+    def _remove(self, key: str) -> None:
+        self._docs.pop(key, None)
+        tf = self._tf.pop(key, None) or {}
+        self._total_len -= self._len.pop(key, 0)
+        for term in tf:
+            post = self._postings.get(term)
+            if post is not None:
+                post.pop(key, None)
+                if not post:
+                    del self._postings[term]
+
+    def add(self, item: dict[str, Any]) -> bool:
+        key = item.get("url") or item.get("title") or ""
+        if not key:
+            return False
+        if key in self._docs:
+            self._remove(key)
+        doc = {
+            "title": item.get("title") or "",
+            "url": item.get("url") or "",
+            "description": item.get("description") or "",
+            "published_at": item.get("published_at") if isinstance(item.get("published_at"), dt.datetime)
+            else _from_iso(item.get("published_at")),
+            "source": item.get("source") or "",
+            "image_url": item.get("image_url"),
+        }
+        tf = _doc_terms(doc["title"], doc["description"])
+        self._docs[key] = doc
+        self._tf[key] = tf
+        dl = sum(tf.values())
+        self._len[key] = dl
+        self._total_len += dl
+        for term, n in tf.items():
+            self._postings.setdefault(term, {})[key] = n
+        while len(self._docs) > self.max_docs:
+            self._remove(next(iter(self._docs)))
+        self._dirty = True
+        return True
+
+    def add_many(self, items: Iterable[dict[str, Any]]) -> int:
+        return sum(1 for it in items if self.add(it))
+
+    # ---------- queries ----------
+    def search(
+        self,
+        terms: Iterable[str],
+        limit: int,
+        *,
+        date_from: Optional[dt.date] = None,
+        date_to: Optional[dt.date] = None,
+        sources: Optional[set[str]] = None,
+        domains: Optional[set[str]] = None,
+    ) -> list[dict[str, Any]]:
+        n_docs = len(self._docs)
+        if not n_docs:
+            return []
+        avgdl = self._total_len / n_docs or 1.0
+
+        scores: dict[str, float] = {}
+        for term in set(terms):
+            post = self._postings.get(term)
+            if not post:
+                continue
+            idf = math.log(1 + (n_docs - len(post) + 0.5) / (len(post) + 0.5))
+            for key, tf in post.items():
+                norm = tf + K1 * (1 - B + B * self._len[key] / avgdl)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (K1 + 1) / norm
+
+        def keep(doc: dict[str, Any]) -> bool:
+            pub = doc["published_at"]
+            if date_from or date_to:
+                if pub is None:
+                    return False
+                day = pub.astimezone(dt.timezone.utc).date()
+                if (date_from and day < date_from) or (date_to and day > date_to):
+                    return False
+            if sources and doc["source"].strip().lower() not in sources \
+                    and doc["source"].strip().lower().replace(" ", "-") not in sources:
+                return False
+            if domains:
+                host = (urlsplit(doc["url"]).hostname or "").lower()
+                if not any(host == d or host.endswith("." + d) for d in domains):
+                    return False
+            return True
+
+        epoch = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+        ranked = heapq.nlargest(
+            limit,
+            (k for k in scores if keep(self._docs[k])),
+            key=lambda k: (scores[k], self._docs[k]["published_at"] or epoch),  # why: newer wins ties
+        )
+        return [dict(self._docs[k]) for k in ranked]
+
+    # ---------- persistence ----------
+    def _mtime(self) -> int:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _read_snapshot(self) -> list[dict[str, Any]]:
+        try:
+            with open(self.path + ".lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_SH)
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    return json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"[index] could not read {self.path}: {e}")
+            return []
+
+    def _write_snapshot(self, rows: list[dict[str, Any]], expected_mtime: int) -> int:
+        """Atomically replace the snapshot unless another worker wrote since we merged; 0 = skipped."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if self._mtime() != expected_mtime:
+                return 0  # why: merge their docs first on the next sync instead of clobbering them
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            return self._mtime()
+
+    async def sync(self) -> None:
+        """
+        Merge docs other workers wrote to the snapshot, then rewrite it if we have new ones.
+        File I/O and (de)serialization run in a thread; index mutation stays on the event loop.
+        """
+        if not self.path:
+            return
+        mtime = await asyncio.to_thread(self._mtime)
+        if mtime and mtime != self._disk_mtime:
+            rows = await asyncio.to_thread(self._read_snapshot)
+            was_dirty = self._dirty
+            for doc in rows:
+                key = doc.get("url") or doc.get("title")
+                if key and key not in self._docs:
+                    self.add(doc)
+            self._dirty = was_dirty
+            self._disk_mtime = mtime
+        if not self._dirty:
+            return
+        rows = [{**d, "published_at": _to_iso(d["published_at"])} for d in self._docs.values()]
+        self._dirty = False
+        written = await asyncio.to_thread(self._write_snapshot, rows, self._disk_mtime)
+        if written:
+            self._disk_mtime = written
+        else:
+            self._dirty = True
@@ -1,7 +1,14 @@
 # backend/app/services/sentiment.py
 from __future__ import annotations
 import re
-from typing import Iterable
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Sequence
+
+try:
+    import numpy as np
+except Exception:  # optional: batch scoring falls back to pure Python
+    np = None
 
 WORD_RE = re.compile(r"[A-Za-z][A-Za-z']+")
 
@@ -82,3 +89,85 @@ def quick_sentiment(text: str) -> float:
     # normalize by rough length cap to keep within [-1,1] but scale with content
     denom = max(3, min(15, len(toks) // 6))
     return max(-1.0, min(1.0, score / denom))
+
+
+# ---------- Batch scoring ----------
+# Token codes: 0 neutral, +1 positive, -1 negative, 2 negation
+NEGATION_CODE = 2
+
+# Stem -> code; precedence mirrors quick_sentiment (negation, then POS, then NEG)
+LEXICON: dict[str, int] = {**{w: -1 for w in NEG}, **{w: 1 for w in POS}, **{w: NEGATION_CODE for w in NEGATIONS}}
+
+@lru_cache(maxsize=65536)
+def _token_code(tok: str) -> int:
+    # why: headlines reuse a small vocabulary; lowercase + stem + lookup once per distinct token
+    t = tok.lower()
+    for suf in ("ies","ing","ed","es","s"):
+        if len(t) > 4 and t.endswith(suf):
+            t = t[: -len(suf)]
+            break
+    return LEXICON.get(t, 0)
+
+def _codes(text: str) -> list[int]:
+    return [_token_code(w) for w in WORD_RE.findall(text or "")]
+
+def _score_codes(codes: Sequence[int]) -> float:
+    if not codes:
+        return 0.0
+    score = 0
+    negate = False
+    for c in codes:
+        if c == NEGATION_CODE:
+            negate = True
+        elif c:
+            score += -c if negate else c
+            negate = False
+    denom = max(3, min(15, len(codes) // 6))
+    return max(-1.0, min(1.0, score / denom))
+
+def _score_batch_numpy(per_doc: list[list[int]]) -> list[float]:
+    n = len(per_doc)
+    lens = np.fromiter((len(c) for c in per_doc), dtype=np.int64, count=n)
+    total = int(lens.sum())
+    if total == 0:
+        return [0.0] * n
+
+    flat = np.fromiter(chain.from_iterable(per_doc), dtype=np.int8, count=total)
+    idx = np.arange(total)
+    doc_id = np.repeat(np.arange(n), lens)
+    starts = np.cumsum(lens) - lens
+
+    is_neg = flat == NEGATION_CODE
+    is_sent = (flat == 1) | (flat == -1)
+
+    # A sentiment word is flipped iff a negation appears after the previous
+    # sentiment word (or the start of its document) and before it.
+    last_neg = np.maximum.accumulate(np.where(is_neg, idx, -1))
+    prev_sent = np.empty(total, dtype=np.int64)
+    prev_sent[0] = -1
+    prev_sent[1:] = np.maximum.accumulate(np.where(is_sent, idx, -1))[:-1]
+    floor = np.maximum(prev_sent, starts[doc_id] - 1)
+    negated = last_neg > floor
+
+    vals = np.where(is_sent, np.where(negated, -flat, flat), 0).astype(np.int64)
+    scores = np.bincount(doc_id, weights=vals, minlength=n)
+    denom = np.clip(lens // 6, 3, 15)
+    out = np.clip(scores / denom, -1.0, 1.0)
+    out[lens == 0] = 0.0
+    return out.tolist()
+
+def quick_sentiment_batch(texts: Sequence[str]) -> list[float]:
+    """
+    Score many texts in one call; element-wise identical to quick_sentiment.
+    Uses NumPy over integer token codes when available, else a pure-Python loop.
+    """
+    return _score_batch([_codes(t) for t in texts])
+
+def sentiment_from_tokens_batch(docs: Sequence[Iterable[str]]) -> list[float]:
+    """Like quick_sentiment_batch, for callers that already hold WORD_RE tokens."""
+    return _score_batch([[_token_code(w) for w in toks] for toks in docs])
+
+def _score_batch(per_doc: list[list[int]]) -> list[float]:
+    if np is None or len(per_doc) < 8:  # why: array setup costs more than it saves on tiny batches
+        return [_score_codes(c) for c in per_doc]
+    return _score_batch_numpy(per_doc)
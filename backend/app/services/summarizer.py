@@ -1,25 +1,47 @@
 # backend/app/services/summarizer.py
 from __future__ import annotations
-from .normalize import strip_html, sent_tokenize, word_freq
+from .normalize import strip_html, sent_tokenize, WORD_RE
 
-def summarize(text: str, max_sentences: int = 3) -> str:
+def extract_summary(text: str, max_sentences: int = 3) -> tuple[str, list[str]]:
+    """
+    Single tokenization pass: returns the extractive summary plus its word
+    tokens (original case, in order) so callers can score sentiment without
+    re-running the regex over the summary.
+    """
     text = strip_html(text)
     sents = sent_tokenize(text)
     if not sents:
-        return ""
-    corpus = " ".join(sents)
-    freq = word_freq(corpus)
+        return "", []
+
+    raw_toks = [WORD_RE.findall(s) for s in sents]
+    # Corpus frequency is the sum of per-sentence frequencies: words never span the joining spaces
+    freq: dict[str, int] = {}
+    sent_words: list[set[str]] = []
+    for s, toks in zip(sents, raw_toks):
+        # why: lowering first can change tokens for a few non-ASCII letters (e.g. 'İ'); only shortcut ASCII
+        low = [t.lower() for t in toks] if s.isascii() else WORD_RE.findall(s.lower())
+        words: set[str] = set()
+        for w in low:
+            if len(w) <= 2:
+                continue
+            freq[w] = freq.get(w, 0) + 1
+            words.add(w)
+        sent_words.append(words)
+
     if not freq:
-        return " ".join(sents[:max_sentences])
+        picked = list(range(min(max_sentences, len(sents))))
+        return " ".join(sents[:max_sentences]), [t for i in picked for t in raw_toks[i]]
 
-    scored: list[tuple[float, int, str]] = []
-    for i, s in enumerate(sents):
-        s_freq = word_freq(s)
-        score = sum(freq.get(w, 0) for w in s_freq.keys())
+    scored: list[tuple[float, int]] = []
+    for i, words in enumerate(sent_words):
+        score = sum(freq[w] for w in words)
         if i == 0:
             score *= 1.15  # why: lead sentences often carry key info
-        scored.append((score, i, s))
+        scored.append((score, i))
 
     scored.sort(key=lambda t: (-t[0], t[1]))
-    top = sorted(scored[:max_sentences], key=lambda t: t[1])
-    return " ".join(s for _, _, s in top).strip()
+    picked = sorted(i for _, i in scored[:max_sentences])
+    return " ".join(sents[i] for i in picked).strip(), [t for i in picked for t in raw_toks[i]]
+
+def summarize(text: str, max_sentences: int = 3) -> str:
+    return extract_summary(text, max_sentences)[0]
@@ -0,0 +1,136 @@
+# backend/app/singleflight.py
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter
+
+# role: leader = ran fn; local = joined an in-worker flight; cluster = got another
+# worker's published result; fallback = Redis unavailable or wait timed out.
+# Coalescing ratio = (local + cluster) / sum(all roles).
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Single-flight participants by role",
+    ["role"],
+)
+
+# Release the lease only if we still own it (it may have expired and been re-taken)
+_RELEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+  return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _text(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls, first within a worker, then across workers.
+
+    In-worker callers with the same key and `scope` share one task. Across
+    workers, a Redis lease (SET NX PX) picks one leader; the rest poll for the
+    JSON result that leader publishes under its own lease token, until it
+    appears, the lease is dropped, or wait_timeout passes. Results must be
+    JSON-serializable (tuples come back as lists).
+
+    A flight runs in a fresh contextvars context, not the first caller's, so
+    one caller's context (quota priority, Server-Timing collector) can't leak
+    to the others; `fn` sets whatever context it needs. Callers that need
+    different context (e.g. quota priority) pass different scopes.
+    """
+
+    def __init__(
+        self,
+        redis,
+        lease_ms: int = 15000,
+        result_ttl_ms: int = 5000,
+        wait_timeout: float = 15.0,
+        poll_interval: float = 0.05,
+        prefix: str = "sf:",
+    ) -> None:
+        self.redis = redis
+        self.lease_ms = lease_ms
+        self.result_ttl_ms = result_ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}  # (scope, key) -> flight
+        self._token = f"{os.getpid()}-{uuid.uuid4().hex}"
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], scope: str = "") -> Any:
+        flight = (scope, key)
+        task = self._inflight.get(flight)
+        if task is not None:
+            SINGLEFLIGHT_CALLS.labels("local").inc()
+        else:
+            task = asyncio.get_running_loop().create_task(self._cluster(key, fn), context=contextvars.Context())
+            self._inflight[flight] = task
+            task.add_done_callback(lambda _t, f=flight: self._inflight.pop(f, None))
+        # why: a disconnecting caller must not cancel the flight others are waiting on
+        return await asyncio.shield(task)
+
+    def _result_key(self, key: str, lease: str) -> str:
+        return f"{self.prefix}{key}:result:{lease}"
+
+    async def _cluster(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.lease_ms <= 0:
+            SINGLEFLIGHT_CALLS.labels("leader").inc()
+            return await fn()
+
+        lease_key = f"{self.prefix}{key}:lease"
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            lease = f"{self._token}:{uuid.uuid4().hex}"  # why: names this flight's result key
+            try:
+                got = await self.redis.set(lease_key, lease, nx=True, px=self.lease_ms)
+            except Exception:
+                SINGLEFLIGHT_CALLS.labels("fallback").inc()
+                return await fn()
+
+            if got:
+                SINGLEFLIGHT_CALLS.labels("leader").inc()
+                try:
+                    result = await fn()
+                    try:
+                        await self.redis.set(self._result_key(key, lease), json.dumps(result), px=self.result_ttl_ms)
+                    except Exception:
+                        pass
+                    return result
+                finally:
+                    try:
+                        await self.redis.eval(_RELEASE_LUA, 1, lease_key, lease)
+                    except Exception:
+                        pass
+
+            # Follower: wait for the result of the flight holding the lease (not an earlier one)
+            owner = None
+            while time.monotonic() < deadline:
+                try:
+                    current = _text(await self.redis.get(lease_key))
+                    if owner is None:
+                        owner = current
+                        if owner is None:
+                            break  # released before we looked; contend again
+                    raw = await self.redis.get(self._result_key(key, owner))
+                    if raw is not None:
+                        SINGLEFLIGHT_CALLS.labels("cluster").inc()
+                        return json.loads(raw)
+                    if current != owner:
+                        break  # leader failed or finished without publishing; contend again
+                except Exception:
+                    break
+                await asyncio.sleep(self.poll_interval)
+
+            if time.monotonic() >= deadline:
+                SINGLEFLIGHT_CALLS.labels("fallback").inc()
+                return await fn()
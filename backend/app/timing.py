@@ -0,0 +1,65 @@
+# backend/app/timing.py
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from prometheus_client import Counter, Histogram
+
+# Stages: cache, fetch (provider.fetch incl. parse), parse, index, summarize, sentiment, enrich (batch),
+# validate (article fields, URL normalization), serialize (JSON body), kafka_emit (enqueue on the bounded
+# publisher; only waits when the queue is full under KAFKA_QUEUE_POLICY=block)
+SEARCH_STAGE_SECONDS = Histogram(
+    "search_stage_seconds",
+    "Per-stage /api/search pipeline latency",
+    ["stage", "provider"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "upstream_request_seconds",
+    "Upstream HTTP request latency including body download",
+    ["provider", "host", "status"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 12),
+)
+UPSTREAM_BYTES = Counter("upstream_bytes_downloaded_total", "Upstream response body bytes", ["provider", "host"])
+ARTICLES_PROCESSED = Counter("search_articles_processed_total", "Articles enriched by /api/search", ["provider"])
+
+# Provider of the search being processed; read by the HTTP pool to label upstream calls
+current_provider: ContextVar[str] = ContextVar("current_provider", default="other")
+# Per-request stage totals for the Server-Timing header (None = not collecting)
+_server_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("server_timings", default=None)
+
+
+@contextmanager
+def stage(name: str, provider: Optional[str] = None) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SEARCH_STAGE_SECONDS.labels(name, provider or current_provider.get()).observe(elapsed)
+        timings = _server_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def collect_server_timing() -> dict[str, float]:
+    """Start collecting stage totals for the current request; tasks it spawns share the dict."""
+    timings: dict[str, float] = {}
+    _server_timings.set(timings)
+    return timings
+
+
+def merge_server_timing(timings: Optional[dict[str, float]]) -> None:
+    """Add stage totals measured elsewhere (e.g. in a shared single-flight) to the current request's."""
+    mine = _server_timings.get()
+    if mine is None or not timings:
+        return
+    for name, secs in timings.items():
+        mine[name] = mine.get(name, 0.0) + secs
+
+
+def server_timing_header(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={secs * 1000:.1f}" for name, secs in timings.items())
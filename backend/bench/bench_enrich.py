@@ -0,0 +1,58 @@
+# backend/bench/bench_enrich.py
+"""
+/api/search enrichment: summarize + quick_sentiment per article vs enrich_articles.
+
+The gain is modest and shrinks as the batch grows: measured 1.24x at 10
+articles and 1.03x at 50 in review, and 0.9x-1.5x across runs on a noisy
+host. Compare several runs before reading much into one.
+
+Run from backend/:  python -m bench.bench_enrich
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from app.services.summarizer import summarize
+from app.services.sentiment import quick_sentiment
+from app.services.analysis import enrich_articles
+from bench.bench_sentiment import make_texts
+
+def make_items(n: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    bodies = make_texts(n * 4, seed=seed)
+    items = []
+    for i in range(n):
+        sents = bodies[i * 4:(i + 1) * 4]
+        desc = "<p>" + " ".join(sents) + "</p>" if rng.random() < 0.5 else " ".join(sents)
+        items.append({"title": bodies[i][:90], "description": desc})
+    return items
+
+def _legacy(items: list[dict], k: int) -> list[tuple[str, float]]:
+    out = []
+    for it in items:
+        base_text = it.get("description") or ""
+        summ = summarize(base_text, max_sentences=k) if base_text else ""
+        out.append((summ, quick_sentiment(f"{it.get('title','')} {summ}")))
+    return out
+
+def run(sizes=(10, 50), k: int = 3, repeat: int = 20) -> None:
+    print(f"{'articles':>9} {'legacy us/art':>14} {'single-pass us/art':>19} {'speedup':>8}")
+    for n in sizes:
+        items = make_items(n)
+        assert [tuple(e) for e in enrich_articles(items, k)] == _legacy(items, k), "enrichment output diverged"
+
+        def best(fn) -> float:
+            b = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                b = min(b, time.perf_counter() - t0)
+            return b
+
+        legacy = best(lambda: _legacy(items, k))
+        single = best(lambda: enrich_articles(items, k))
+        print(f"{n:>9} {legacy / n * 1e6:>14.2f} {single / n * 1e6:>19.2f} {legacy / single:>7.2f}x")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,188 @@
+# backend/bench/bench_middleware.py
+"""
+Middleware stack: @app.middleware("http") (BaseHTTPMiddleware) vs pure ASGI.
+
+"before" rebuilds the old stack: security headers and body-size limit as
+@app.middleware("http") functions, plus a rate-limit key function that copies
+every header into a lowercased dict to pick the client IP. "after" is
+app/middleware.py (ClientIPMiddleware, SecurityHeadersMiddleware,
+BodySizeLimitMiddleware) with the key read from scope["client_ip"]. Both apps
+serve a small JSON endpoint and a chunked streaming endpoint and are driven
+in-process with raw ASGI calls (no sockets) by C concurrent clients for D
+seconds; responses are checked to be identical first.
+
+Run from backend/:
+    python -m bench.bench_middleware
+    python -m bench.bench_middleware --concurrency 128 --duration 5 --json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Any, Callable
+
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.middleware import BodySizeLimitMiddleware, ClientIPMiddleware, SecurityHeadersMiddleware
+from bench.loadgen import _percentile
+
+MAX_BODY = 1 << 20
+CHUNKS = 8
+IP_RE = re.compile(r"\s*([^,\s]+)\s*")
+HEADERS = [
+    (b"host", b"bench"),
+    (b"user-agent", b"bench/1.0"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate"),
+    (b"x-forwarded-for", b"203.0.113.7, 10.0.0.2"),
+    (b"x-request-id", b"0123456789abcdef"),
+    (b"cookie", b"session=abc; theme=dark"),
+]
+
+def _legacy_pick_ip(request: Request) -> str:
+    headers = {k.lower(): v for k, v in request.headers.items()}
+    cf_ip = headers.get("cf-connecting-ip")
+    if cf_ip:
+        return cf_ip.strip()
+    xff = headers.get("x-forwarded-for")
+    if xff:
+        m = IP_RE.match(xff)
+        if m:
+            return m.group(1)
+    xreal = headers.get("x-real-ip")
+    if xreal:
+        return xreal.strip()
+    return request.client.host if request.client else "0.0.0.0"
+
+def _routes(app: FastAPI, key_func: Callable[[Request], str]) -> None:
+    async def limit(request: Request) -> None:
+        request.state.rl_key = key_func(request)  # stands in for the limiter's key lookup
+
+    @app.get("/json", dependencies=[Depends(limit)])
+    async def small_json():
+        return {"query": "acme", "count": 3, "articles": [{"title": "t", "url": "https://e.x/1"}]}
+
+    @app.get("/stream", dependencies=[Depends(limit)])
+    async def stream():
+        async def gen():
+            for i in range(CHUNKS):
+                yield f'{{"i": {i}}}\n'.encode()
+        return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+def before_app() -> FastAPI:
+    app = FastAPI()
+    _routes(app, _legacy_pick_ip)
+
+    @app.middleware("http")
+    async def security_headers_mw(request: Request, call_next):
+        resp = await call_next(request)
+        resp.headers["X-Content-Type-Options"] = "nosniff"
+        resp.headers["X-Frame-Options"] = "DENY"
+        resp.headers["Referrer-Policy"] = "no-referrer"
+        resp.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        resp.headers.setdefault(
+            "Content-Security-Policy",
+            "default-src 'self' http://localhost:5173 data: blob:; "
+            "img-src * data: blob:; connect-src *; "
+            "style-src 'self' 'unsafe-inline' http://localhost:5173; "
+            "script-src 'self' 'unsafe-inline'"
+        )
+        return resp
+
+    @app.middleware("http")
+    async def body_size_limit_mw(request: Request, call_next):
+        cl = request.headers.get("content-length")
+        if cl and cl.isdigit() and int(cl) > MAX_BODY:
+            return Response(status_code=413, content="Payload Too Large")
+        return await call_next(request)
+
+    return app
+
+def after_app() -> FastAPI:
+    app = FastAPI()
+    _routes(app, lambda request: request.scope["client_ip"])
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=MAX_BODY)
+    app.add_middleware(ClientIPMiddleware)
+    return app
+
+async def _call(app, path: str) -> tuple[int, list, bytes]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": list(HEADERS), "client": ("10.0.0.2", 40000), "server": ("bench", 80),
+    }
+    sent = False
+    status, headers, body = 0, [], bytearray()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # why: no disconnect until the response is done
+
+    async def send(message):
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status, headers = message["status"], message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, sorted((bytes(k).lower(), bytes(v)) for k, v in headers), bytes(body)
+
+async def _drive(app, path: str, concurrency: int, duration: float) -> dict[str, Any]:
+    latencies: list[float] = []
+    stop = time.perf_counter() + duration
+
+    async def client() -> None:
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            status, _, _ = await _call(app, path)
+            latencies.append(time.perf_counter() - t0)
+            assert status == 200, status
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+async def main(args: argparse.Namespace) -> dict[str, Any]:
+    apps = {"before": before_app(), "after": after_app()}
+    for path in ("/json", "/stream"):
+        old, new = await _call(apps["before"], path), await _call(apps["after"], path)
+        assert old == new, f"{path}: responses differ\n{old}\n{new}"
+
+    results: dict[str, Any] = {}
+    for path in ("/json", "/stream"):
+        for name, app in apps.items():
+            await _drive(app, path, args.concurrency, min(0.5, args.duration))  # warm-up
+            results[f"{name} {path}"] = await _drive(app, path, args.concurrency, args.duration)
+    return results
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--duration", type=float, default=3.0)
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args()
+    results = asyncio.run(main(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'stack':<16} {'requests':>9} {'rps':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, r in results.items():
+            print(f"{name:<16} {r['requests']:>9} {r['rps']:>10.1f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f}")
+        for path in ("/json", "/stream"):
+            print(f"{path}: {results[f'after {path}']['rps'] / results[f'before {path}']['rps']:.2f}x rps")
@@ -0,0 +1,49 @@
+# backend/bench/bench_sentiment.py
+"""
+Per-article cost of quick_sentiment (one call per article) vs quick_sentiment_batch.
+
+Run from backend/:  python -m bench.bench_sentiment
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from app.services.sentiment import quick_sentiment, quick_sentiment_batch, POS_RAW, NEG_RAW, NEGATIONS
+
+FILLER = (
+    "the company said shares of its stock in early trading on Tuesday after analysts "
+    "reported quarterly revenue and the market for chips while investors weighed"
+).split()
+
+def make_texts(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocab = FILLER * 4 + sorted(POS_RAW) + sorted(NEG_RAW) + sorted(NEGATIONS)
+    out = []
+    for _ in range(n):
+        words = [rng.choice(vocab) for _ in range(rng.randint(20, 70))]
+        words[0] = words[0].capitalize()
+        out.append(" ".join(words) + ".")
+    return out
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def run(sizes=(50, 5000), repeat: int = 5) -> None:
+    print(f"{'articles':>9} {'loop us/art':>12} {'batch us/art':>13} {'speedup':>8}")
+    for n in sizes:
+        texts = make_texts(n)
+        ref = [quick_sentiment(t) for t in texts]
+        assert quick_sentiment_batch(texts) == ref, "batch output diverged from quick_sentiment"
+
+        loop_s = _best_of(lambda: [quick_sentiment(t) for t in texts], repeat)
+        batch_s = _best_of(lambda: quick_sentiment_batch(texts), repeat)
+        print(f"{n:>9} {loop_s / n * 1e6:>12.2f} {batch_s / n * 1e6:>13.2f} {loop_s / batch_s:>7.2f}x")
+
+if __name__ == "__main__":
+    run()
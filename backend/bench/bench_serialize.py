@@ -0,0 +1,134 @@
+# backend/bench/bench_serialize.py
+"""
+/api/search body: Article + SearchResponse models + model_dump_json (before)
+vs article_fields + search_response_json (after).
+
+Every case first checks that both paths produce byte-identical JSON: the
+fixtures (NewsAPI and both RSS feeds) plus generated edge cases (non-ASCII
+and control characters, URLs HttpUrl rewrites, naive/UTC/offset datetimes,
+ISO date strings, NaN sentiment). Timings are best-of-N per response at
+limit 10 and 50, with the URL cache warm (the same links come back across
+searches) and cold (cache cleared before each call).
+
+Run from backend/:
+    python -m bench.bench_serialize
+    python -m bench.bench_serialize --repeat 500 --json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import random
+import time
+from typing import Any, Callable
+
+from app.models import Article, SearchResponse, article_fields, normalize_url, search_response_json
+from app.providers.newsapi import NewsAPIProvider
+from bench.run import _load_fixtures, _parse_rss
+
+def _legacy(query: str, provider: str, items: list[tuple[dict, str, float]]) -> str:
+    articles = [
+        Article(
+            title=it.get("title", "").strip(),
+            url=it.get("url", "https://example.com"),
+            source=it.get("source", "Unknown"),
+            published_at=it.get("published_at"),
+            summary=summary,
+            sentiment=sentiment,
+            image_url=it.get("image_url"),
+        )
+        for it, summary, sentiment in items
+    ]
+    return SearchResponse(query=query, provider=provider, count=len(articles), articles=articles).model_dump_json()
+
+def _fast(query: str, provider: str, items: list[tuple[dict, str, float]]) -> str:
+    return search_response_json(query, provider, [article_fields(it, summ, sent) for it, summ, sent in items])
+
+def _edge_cases(n: int = 200, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    titles = ["  Ünïcode — “quotes” ", "tab\tnew\nline", "nul\x00 del\x7f", "emoji 📈   sep", 'q"uo\\te/']
+    urls = [
+        "https://example.com", "HTTPS://Example.COM/a b?x=1&y=é", "https://bücher.de/path",
+        "http://example.com:80/x/../y", "https://example.com/%7Euser#frag",
+    ]
+    dates: list[Any] = [
+        None, dt.datetime(2024, 5, 1, 12, 0, tzinfo=dt.timezone.utc), dt.datetime(2024, 5, 1, 12, 0, 0, 123456),
+        dt.datetime(2024, 5, 1, 12, 0, tzinfo=dt.timezone(dt.timedelta(hours=-4))), "2024-05-01T12:00:00Z",
+    ]
+    out = []
+    for i in range(n):
+        out.append({
+            "title": rng.choice(titles) + str(i),
+            "url": rng.choice(urls),
+            "source": rng.choice(["Reuters", "Yahoo Finance", "Ünï"]),
+            "published_at": rng.choice(dates),
+            "image_url": rng.choice([None, *urls]),
+        })
+    return out
+
+def build_sets() -> dict[str, list[dict[str, Any]]]:
+    fx = _load_fixtures()
+    return {
+        "newsapi": NewsAPIProvider("bench")._project(fx["newsapi"]),
+        "google_news": _parse_rss(fx["google_xml"]),
+        "yahoo_finance": _parse_rss(fx["yahoo_xml"]),
+        "edge_cases": _edge_cases(),
+    }
+
+def _enrich(items: list[dict[str, Any]], seed: int = 3) -> list[tuple[dict, str, float]]:
+    rng = random.Random(seed)
+    sentiments = [rng.uniform(-1, 1) for _ in items]
+    if sentiments:
+        sentiments[0] = float("nan")
+    return [(it, f"Summary {i}: {it.get('title', '')[:40]}.", s) for i, (it, s) in enumerate(zip(items, sentiments))]
+
+def _best(fn: Callable[[], Any], repeat: int, before: Callable[[], Any] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        before()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def run(repeat: int) -> dict[str, Any]:
+    sets = build_sets()
+    checked = 0
+    for name, items in sets.items():
+        enriched = _enrich(items)
+        for k in range(1, len(enriched) + 1, 7):
+            old, new = _legacy("AAPL", "rss", enriched[:k]), _fast("AAPL", "rss", enriched[:k])
+            assert old.encode() == new.encode(), f"{name}[:{k}] differs:\n{old}\n{new}"
+            checked += 1
+
+    pool = [it for items in sets.values() for it in items if not isinstance(it.get("published_at"), str)]
+    results: dict[str, Any] = {"identical_checks": checked}
+    for limit in (10, 50):
+        enriched = _enrich((pool * (limit // len(pool) + 1))[:limit])
+        legacy = _best(lambda: _legacy("AAPL", "newsapi", enriched), repeat)
+        warm = _best(lambda: _fast("AAPL", "newsapi", enriched), repeat)
+        cold = _best(lambda: _fast("AAPL", "newsapi", enriched), repeat, normalize_url.cache_clear)
+        results[f"limit={limit}"] = {
+            "legacy_us": round(legacy * 1e6, 1),
+            "fast_warm_us": round(warm * 1e6, 1),
+            "fast_cold_us": round(cold * 1e6, 1),
+            "speedup_warm": round(legacy / warm, 2),
+            "speedup_cold": round(legacy / cold, 2),
+        }
+    return results
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args()
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"byte-identical: {results.pop('identical_checks')} responses checked")
+        print(f"{'case':<10} {'legacy us':>10} {'warm us':>9} {'cold us':>9} {'warm x':>7} {'cold x':>7}")
+        for name, r in results.items():
+            print(f"{name:<10} {r['legacy_us']:>10.1f} {r['fast_warm_us']:>9.1f} {r['fast_cold_us']:>9.1f} "
+                  f"{r['speedup_warm']:>6.2f}x {r['speedup_cold']:>6.2f}x")
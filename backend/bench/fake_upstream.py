@@ -0,0 +1,98 @@
+# backend/bench/fake_upstream.py
+"""
+Stand-in for Google News, Yahoo Finance RSS and NewsAPI, serving bench/fixtures.
+
+Point the API at it with:
+    RSS_FEEDS=http://127.0.0.1:9100/rss/google?q={q},http://127.0.0.1:9100/rss/yahoo?s={q}
+    NEWSAPI_BASE_URL=http://127.0.0.1:9100
+    NEWSAPI_KEY=fake
+
+Behaviour knobs (env, read at startup):
+    FAKE_LATENCY_MS   base latency per response (default 80)
+    FAKE_JITTER_MS    uniform extra latency in [0, JITTER] (default 40)
+    FAKE_ERROR_RATE   fraction of 500s (default 0)
+    FAKE_429_RATE     fraction of 429s with Retry-After (default 0)
+    FAKE_ETAG         1 = send ETag and honour If-None-Match on RSS (default 1)
+
+Run from backend/:  python -m bench.fake_upstream --port 9100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+LATENCY_MS = float(os.getenv("FAKE_LATENCY_MS", "80"))
+JITTER_MS = float(os.getenv("FAKE_JITTER_MS", "40"))
+ERROR_RATE = float(os.getenv("FAKE_ERROR_RATE", "0"))
+RATE_429 = float(os.getenv("FAKE_429_RATE", "0"))
+ETAG_ENABLED = os.getenv("FAKE_ETAG", "1") == "1"
+
+GOOGLE_XML = (FIXTURES / "google_news.xml").read_bytes()
+YAHOO_XML = (FIXTURES / "yahoo_finance.xml").read_bytes()
+NEWSAPI = json.loads((FIXTURES / "newsapi_everything.json").read_text(encoding="utf-8"))
+
+app = FastAPI(title="fake-upstream")
+stats = {"requests": 0, "errors": 0, "rate_limited": 0, "not_modified": 0}
+
+async def _misbehave() -> Response | None:
+    stats["requests"] += 1
+    await asyncio.sleep((LATENCY_MS + random.uniform(0, JITTER_MS)) / 1000.0)
+    roll = random.random()
+    if roll < RATE_429:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            {"status": "error", "code": "rateLimited", "message": "You have made too many requests."},
+            status_code=429,
+            headers={"Retry-After": "1"},
+        )
+    if roll < RATE_429 + ERROR_RATE:
+        stats["errors"] += 1
+        return Response("upstream exploded", status_code=500)
+    return None
+
+def _rss(request: Request, body: bytes) -> Response:
+    if ETAG_ENABLED:
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            stats["not_modified"] += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/rss+xml", headers={"ETag": etag})
+    return Response(body, media_type="application/rss+xml")
+
+@app.get("/rss/google")
+async def rss_google(request: Request):
+    return await _misbehave() or _rss(request, GOOGLE_XML)
+
+@app.get("/rss/yahoo")
+async def rss_yahoo(request: Request):
+    return await _misbehave() or _rss(request, YAHOO_XML)
+
+@app.get("/v2/everything")
+async def newsapi_everything(pageSize: int = 20):
+    bad = await _misbehave()
+    if bad is not None:
+        return bad
+    return {**NEWSAPI, "articles": NEWSAPI["articles"][: max(1, min(pageSize, 100))]}
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+if __name__ == "__main__":
+    import uvicorn
+
+    ap = argparse.ArgumentParser(description="Fake RSS/NewsAPI upstream")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    args = ap.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
@@ -0,0 +1,236 @@
+# backend/bench/loadgen.py
+"""
+End-to-end load harness for /api/search.
+
+By default it starts bench.fake_upstream and the API under gunicorn with N
+workers, points the providers at the fake, drives /api/search with C
+concurrent clients for D seconds and prints a JSON report (throughput,
+p50/p95/p99 latency, status/error breakdown, upstream stats).
+
+Run from backend/:
+    python -m bench.loadgen --workers 3 --concurrency 32 --duration 20
+    python -m bench.loadgen --provider newsapi --latency-ms 200 --rate-429 0.05 --json report.json
+    python -m bench.loadgen --url http://localhost:8000     # drive an already-running API
+
+Notes:
+    * The API's rate limiter is disabled for the run (RATE_LIMIT_ENABLED=0).
+    * The response cache is off unless --cache-ttl > 0, so the pipeline is measured.
+    * Redis is whatever REDIS_URL points to; without it cache/single-flight fall back.
+    * The load generator shares the machine with the server; compare runs on the same box.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_QUERIES = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOGL", "ORCL", "NFLX", "IBM"]
+
+def _percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, round(p / 100.0 * (len(sorted_vals) - 1))))
+    return sorted_vals[k]
+
+def _spawn(args: list[str], env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        args,
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+async def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                r = await client.get(url, timeout=1.0)
+                if r.status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+async def drive(
+    base_url: str,
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    providers: list[str],
+    queries: list[str],
+    limit: int,
+    seed: int,
+) -> dict[str, Any]:
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def one(record: bool) -> None:
+            params = {"query": rng.choice(queries), "provider": rng.choice(providers), "limit": limit}
+            t0 = time.perf_counter()
+            try:
+                r = await client.get("/api/search", params=params)
+                key = str(r.status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            if record:
+                latencies.append(time.perf_counter() - t0)
+                statuses[key] = statuses.get(key, 0) + 1
+
+        async def worker(until: float, record: bool) -> None:
+            while time.perf_counter() < until:
+                await one(record)
+
+        if warmup > 0:
+            until = time.perf_counter() + warmup
+            await asyncio.gather(*(worker(until, False) for _ in range(concurrency)))
+
+        started = time.perf_counter()
+        until = started + duration
+        await asyncio.gather(*(worker(until, True) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    lat_ms = sorted(x * 1000.0 for x in latencies)
+    total = len(lat_ms)
+    ok = statuses.get("200", 0)
+    return {
+        "requests": total,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "ok_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(lat_ms, 50), 2),
+            "p95": round(_percentile(lat_ms, 95), 2),
+            "p99": round(_percentile(lat_ms, 99), 2),
+            "max": round(lat_ms[-1], 2) if lat_ms else 0.0,
+            "mean": round(sum(lat_ms) / total, 2) if total else 0.0,
+        },
+        "status": statuses,
+        "error_rate": round(1 - ok / total, 4) if total else 0.0,
+    }
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    procs: list[subprocess.Popen] = []
+    base_url = args.url
+    upstream = f"http://127.0.0.1:{args.upstream_port}"
+    try:
+        if not base_url:
+            procs.append(_spawn(
+                [sys.executable, "-m", "bench.fake_upstream", "--port", str(args.upstream_port)],
+                {
+                    "FAKE_LATENCY_MS": str(args.latency_ms),
+                    "FAKE_JITTER_MS": str(args.jitter_ms),
+                    "FAKE_ERROR_RATE": str(args.error_rate),
+                    "FAKE_429_RATE": str(args.rate_429),
+                },
+            ))
+            await _wait_ready(f"{upstream}/stats")
+
+            procs.append(_spawn(
+                [
+                    sys.executable, "-m", "gunicorn",
+                    "-c", "infra/gunicorn_conf.py",
+                    "--access-logfile", "/dev/null",
+                    "app.main:app",
+                ],
+                {
+                    "PORT": str(args.port),
+                    "WEB_CONCURRENCY": str(args.workers),
+                    "RSS_FEEDS": f"{upstream}/rss/google?q={{q}},{upstream}/rss/yahoo?s={{q}}",
+                    "NEWSAPI_BASE_URL": upstream,
+                    "NEWSAPI_KEY": "fake",
+                    "RATE_LIMIT_ENABLED": "0",
+                    "SEARCH_CACHE_TTL": str(args.cache_ttl),
+                    "DATABASE_URL": "",
+                    "LOCAL_INDEX_PATH": "",
+                    "ENABLE_KAFKA": "0",
+                    # why: the compose hostname "redis" doesn't resolve locally and each lookup stalls
+                    "REDIS_URL": os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"),
+                },
+            ))
+            base_url = f"http://127.0.0.1:{args.port}"
+            await _wait_ready(f"{base_url}/api/health", timeout=60.0)
+
+        result = await drive(
+            base_url,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            providers=args.provider.split(","),
+            queries=args.queries.split(",") if args.queries else DEFAULT_QUERIES,
+            limit=args.limit,
+            seed=args.seed,
+        )
+        result["config"] = {
+            "url": base_url,
+            "workers": None if args.url else args.workers,
+            "concurrency": args.concurrency,
+            "provider": args.provider,
+            "limit": args.limit,
+            "cache_ttl": args.cache_ttl,
+            "upstream": None if args.url else {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "rate_429": args.rate_429,
+            },
+        }
+        if not args.url:
+            async with httpx.AsyncClient() as client:
+                result["upstream_stats"] = (await client.get(f"{upstream}/stats")).json()
+        return result
+    finally:
+        for p in reversed(procs):
+            p.terminate()
+        for p in procs:
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="", help="drive an existing API instead of spawning one")
+    ap.add_argument("--workers", type=int, default=3, help="gunicorn workers")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--upstream-port", type=int, default=9100)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=15.0)
+    ap.add_argument("--warmup", type=float, default=2.0)
+    ap.add_argument("--provider", default="rss", help="rss, newsapi, local or a comma-separated mix")
+    ap.add_argument("--queries", default="", help="comma-separated; default is a ticker mix")
+    ap.add_argument("--limit", type=int, default=10)
+    ap.add_argument("--cache-ttl", type=int, default=0, help="SEARCH_CACHE_TTL for the spawned API")
+    ap.add_argument("--latency-ms", type=float, default=80.0)
+    ap.add_argument("--jitter-ms", type=float, default=40.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", type=Path, help="also write the report here")
+    args = ap.parse_args(argv)
+
+    report = asyncio.run(main_async(args))
+    out = json.dumps(report, indent=2)
+    print(out)
+    if args.json:
+        args.json.write_text(out + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# backend/bench/run.py
+"""
+Micro-benchmarks for the enrichment and parsing hot paths.
+
+Fixtures in bench/fixtures/ are checked in so runs are reproducible. Each case
+reports ops/sec (best of N timed rounds) and the tracemalloc peak for one op.
+Results are compared against bench/baseline.json; an ops/sec drop larger than
+--tolerance fails the run (exit 1). Baselines are machine-specific: refresh
+with --save-baseline on the machine you compare on.
+
+Run from backend/:
+    python -m bench.run                 # compare against baseline
+    python -m bench.run --save-baseline
+    python -m bench.run -k summarize --json out.json
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import feedparser
+
+from app.models import Article, SearchResponse, article_fields, search_response_json
+from app.providers.newsapi import NewsAPIProvider
+from app.providers.rss import _project_entry
+from app.services.normalize import strip_html, sent_tokenize
+from app.services.sentiment import quick_sentiment
+from app.services.summarizer import summarize
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES = BENCH_DIR / "fixtures"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+def _load_fixtures() -> dict[str, Any]:
+    return {
+        "google_xml": (FIXTURES / "google_news.xml").read_text(encoding="utf-8"),
+        "yahoo_xml": (FIXTURES / "yahoo_finance.xml").read_text(encoding="utf-8"),
+        "newsapi": json.loads((FIXTURES / "newsapi_everything.json").read_text(encoding="utf-8")),
+        "long_html": json.loads((FIXTURES / "long_descriptions.json").read_text(encoding="utf-8")),
+    }
+
+def _parse_rss(xml: str) -> list[dict[str, Any]]:
+    parsed = feedparser.parse(xml)
+    title = getattr(parsed.feed, "title", "RSS")
+    return [_project_entry(e, title) for e in parsed.entries]
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    fx = _load_fixtures()
+    long_html: list[str] = fx["long_html"]
+    stripped = [strip_html(h) for h in long_html]
+    provider = NewsAPIProvider("bench")
+    projected = provider._project(fx["newsapi"])
+    rss_items = _parse_rss(fx["yahoo_xml"])
+    sentiment_texts = [f"{it['title']} {it['description']}" for it in projected]
+
+    enriched = [
+        Article(
+            title=it["title"],
+            url=it["url"],
+            source=it["source"],
+            published_at=it["published_at"],
+            summary=summarize(it["description"], 3),
+            sentiment=quick_sentiment(f"{it['title']} {it['description']}"),
+            image_url=it["image_url"],
+        )
+        for it in projected
+    ]
+    response = SearchResponse(query="AAPL", provider="newsapi", count=len(enriched), articles=enriched)
+    enriched_pairs = [(it, a.summary, a.sentiment) for it, a in zip(projected, enriched)]
+
+    # One op = one pass over the whole fixture set, so numbers stay comparable as fixtures grow
+    return {
+        "strip_html[long_html]": lambda: [strip_html(h) for h in long_html],
+        "sent_tokenize[long_html]": lambda: [sent_tokenize(t) for t in stripped],
+        "summarize[long_html]": lambda: [summarize(h, 3) for h in long_html],
+        "summarize[newsapi]": lambda: [summarize(it["description"], 3) for it in projected],
+        "quick_sentiment[newsapi]": lambda: [quick_sentiment(t) for t in sentiment_texts],
+        "newsapi._project": lambda: provider._project(fx["newsapi"]),
+        "rss.parse[google_news]": lambda: _parse_rss(fx["google_xml"]),
+        "rss.parse[yahoo_finance]": lambda: _parse_rss(fx["yahoo_xml"]),
+        "Article.build[rss]": lambda: [
+            Article(title=it["title"], url=it["url"], source=it["source"], published_at=it["published_at"])
+            for it in rss_items
+        ],
+        "SearchResponse.validate": lambda: SearchResponse(
+            query="AAPL", provider="newsapi", count=len(enriched), articles=enriched,
+        ),
+        "SearchResponse.model_dump_json": lambda: response.model_dump_json(),
+        "search_response_json[newsapi]": lambda: search_response_json(
+            "AAPL", "newsapi", [article_fields(it, summ, sent) for it, summ, sent in enriched_pairs],
+        ),
+    }
+
+def measure(fn: Callable[[], Any], rounds: int, min_round_s: float) -> dict[str, float]:
+    fn()  # warm-up (imports, regex caches, lru caches)
+
+    # Calibrate: enough calls per round to run for at least min_round_s
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        if time.perf_counter() - t0 >= min_round_s or n >= 1 << 20:
+            break
+        n *= 2
+
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / n)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": 1.0 / best, "us_per_op": best * 1e6, "alloc_peak_kib": peak / 1024}
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    for name, r in results.items():
+        b = base_cases.get(name)
+        if not b:
+            r["vs_baseline"] = None
+            continue
+        ratio = r["ops_per_sec"] / b["ops_per_sec"]
+        r["vs_baseline"] = ratio
+        if ratio < 1.0 - tolerance:
+            regressions.append(f"{name}: {ratio:.2f}x baseline ops/sec")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-k", dest="filter", default="", help="only run cases whose name contains this")
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--min-round", type=float, default=0.2, help="seconds per timed round")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed ops/sec drop (0.25 = 25%%)")
+    ap.add_argument("--json", type=Path, help="write results as JSON here")
+    args = ap.parse_args(argv)
+
+    cases = {k: v for k, v in build_cases().items() if args.filter in k}
+    results: dict[str, dict[str, float]] = {}
+    for name, fn in cases.items():
+        results[name] = measure(fn, args.rounds, args.min_round)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance) if not args.save_baseline else []
+
+    print(f"{'case':<32} {'ops/sec':>11} {'us/op':>11} {'peak KiB':>10} {'vs base':>8}")
+    for name, r in results.items():
+        vs = r.get("vs_baseline")
+        print(f"{name:<32} {r['ops_per_sec']:>11.1f} {r['us_per_op']:>11.1f} {r['alloc_peak_kib']:>10.1f} "
+              f"{(f'{vs:.2f}x' if vs else '-'):>8}")
+
+    meta = {
+        "created": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+    }
+    if args.json:
+        args.json.write_text(json.dumps({"meta": meta, "cases": results}, indent=2))
+    if args.save_baseline:
+        merged = {**baseline.get("cases", {}), **results}
+        args.baseline.write_text(json.dumps({"meta": meta, "cases": merged}, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+
+    if regressions:
+        print("\nREGRESSIONS (beyond tolerance):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# backend/tests/conftest.py
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # why: `import app...` from any cwd
+
+@pytest.fixture
+def redis():
+    """In-memory async Redis with Lua (fakeredis + lupa)."""
+    import fakeredis.aioredis
+
+    return fakeredis.aioredis.FakeRedis()
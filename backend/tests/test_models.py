@@ -0,0 +1,37 @@
+# backend/tests/test_models.py
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import Article, SearchResponse, article_fields, search_response_json
+
+ITEMS = [
+    {"title": "  Ünïcode “quotes” \x00 ", "url": "HTTPS://Example.COM/a b?x=é", "source": "Reuters",
+     "published_at": dt.datetime(2024, 5, 1, 12, 0, tzinfo=dt.timezone.utc), "image_url": "https://bücher.de/i.png"},
+    {"title": "naive", "url": "https://example.com", "source": "Yahoo",
+     "published_at": dt.datetime(2024, 5, 1, 12, 0, 0, 123456), "image_url": None},
+    {"title": "offset", "url": "http://example.com:80/x/../y", "source": "CNBC",
+     "published_at": "2024-05-01T12:00:00-04:00"},
+    {"title": "no date", "source": "Unknown"},
+]
+
+def test_fast_path_is_byte_identical_to_the_models():
+    enriched = [(it, f"summary {i}", s) for i, (it, s) in enumerate(zip(ITEMS, [0.25, float("nan"), -1, None]))]
+    articles = [
+        Article(
+            title=it.get("title", "").strip(), url=it.get("url", "https://example.com"),
+            source=it.get("source", "Unknown"), published_at=it.get("published_at"),
+            summary=summ, sentiment=sent, image_url=it.get("image_url"),
+        )
+        for it, summ, sent in enriched
+    ]
+    expected = SearchResponse(query="q", provider="rss", count=len(articles), articles=articles).model_dump_json()
+    fast = search_response_json("q", "rss", [article_fields(it, summ, sent) for it, summ, sent in enriched])
+    assert fast.encode() == expected.encode()
+
+def test_bad_url_still_raises():
+    with pytest.raises(ValidationError):
+        article_fields({"title": "t", "url": "ftp://example.com"}, "", 0.0)
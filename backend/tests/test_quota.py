@@ -0,0 +1,107 @@
+# backend/tests/test_quota.py
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import time
+
+import pytest
+
+from app.quota import QuotaExhausted, QuotaGovernor, parse_retry_after, quota_priority
+
+def _governor(redis, **kw) -> QuotaGovernor:
+    kw.setdefault("per_day", 10)
+    kw.setdefault("max_wait", 0.0)
+    return QuotaGovernor(redis, "test", **kw)
+
+def test_bucket_grants_capacity_then_rejects(redis):
+    async def main():
+        g = _governor(redis)
+        for _ in range(10):
+            await g.acquire("interactive")
+        with pytest.raises(QuotaExhausted) as exc:
+            await g.acquire("interactive")
+        return g.remaining, exc.value
+
+    remaining, exc = asyncio.run(main())
+    assert remaining == 0
+    assert exc.reason == "quota exhausted" and exc.retry_after > 0
+
+def test_background_leaves_the_reserve_for_interactive(redis):
+    async def main():
+        g = _governor(redis, reserve=0.3)
+        granted = 0
+        try:
+            while True:
+                await g.acquire("background")
+                granted += 1
+        except QuotaExhausted:
+            pass
+        await g.acquire("interactive")  # the reserve is still there for users
+        return granted
+
+    assert asyncio.run(main()) == 7
+
+def test_priority_defaults_to_the_context(redis):
+    async def main():
+        g = _governor(redis, reserve=1.0)
+        quota_priority.set("background")
+        with pytest.raises(QuotaExhausted):
+            await g.acquire()
+
+    asyncio.run(main())
+
+def test_bucket_is_shared_across_workers(redis):
+    async def main():
+        a, b = _governor(redis), _governor(redis)
+        for i in range(10):
+            await (a if i % 2 else b).acquire("interactive")
+        with pytest.raises(QuotaExhausted):
+            await b.acquire("interactive")
+
+    asyncio.run(main())
+
+def test_upstream_429_backs_off_every_worker(redis):
+    async def main():
+        a, b = _governor(redis, per_day=0), _governor(redis, per_day=0)
+        await b.acquire("interactive")  # no budget configured: only the backoff applies
+        assert await a.backoff("2") >= 2
+        with pytest.raises(QuotaExhausted) as exc:
+            await b.acquire("interactive")
+        return exc.value
+
+    exc = asyncio.run(main())
+    assert exc.reason == "rate limited upstream" and 0 < exc.retry_after <= 2
+
+def test_backoff_only_lengthens(redis):
+    async def main():
+        g = _governor(redis)
+        await g.backoff("30")
+        await g.backoff("1")
+        return await redis.pttl("quota:test:backoff")
+
+    assert asyncio.run(main()) > 25_000
+
+def test_interactive_waits_for_refill(redis):
+    async def main():
+        g = _governor(redis, per_day=86_400 * 20, capacity=1, max_wait=1.0)  # refills 1 token per 50 ms
+        await g.acquire("interactive")
+        started = time.monotonic()
+        await g.acquire("interactive")
+        return time.monotonic() - started
+
+    assert 0.02 < asyncio.run(main()) < 0.5
+
+def test_redis_errors_fail_open():
+    class Broken:
+        async def eval(self, *a):
+            raise ConnectionError("down")
+
+    asyncio.run(_governor(Broken()).acquire("background"))
+
+def test_parse_retry_after():
+    assert parse_retry_after("120", 60) == 120.0
+    assert parse_retry_after(None, 60) == 60
+    assert parse_retry_after("soon", 60) == 60
+    when = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 < parse_retry_after(when, 60) <= 30
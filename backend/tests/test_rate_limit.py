@@ -0,0 +1,115 @@
+# backend/tests/test_rate_limit.py
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.rate_limit import RateLimiter
+
+def _limiter(redis, **kw) -> RateLimiter:
+    return RateLimiter(redis, key_func=lambda request: "client", **kw)
+
+async def _settle(*limiters: RateLimiter) -> None:
+    for lim in limiters:
+        if lim._charges:
+            await asyncio.gather(*lim._charges)
+
+def test_limit_is_exact_without_local_allowance(redis):
+    async def main():
+        lim = _limiter(redis, local_lease=0)
+        return [(await lim.hit("c", "10/second")).allowed for _ in range(20)]
+
+    assert sum(asyncio.run(main())) == 10
+
+def test_client_at_80_percent_is_never_denied(redis):
+    # 8 req/s against 10/second, spread over two workers sharing Redis, for 3 windows
+    async def main():
+        workers = [_limiter(redis), _limiter(redis)]
+        denied = 0
+        for i in range(24):
+            d = await workers[i % 2].hit("c", "10/second")
+            denied += not d.allowed
+            await asyncio.sleep(0.125)
+        await _settle(*workers)
+        return denied
+
+    assert asyncio.run(main()) == 0
+
+def test_burst_at_80_percent_is_never_denied(redis):
+    async def main():
+        lim = _limiter(redis, local_ttl=1.0)
+        denied = 0
+        for _ in range(3):
+            for _ in range(8):
+                denied += not (await lim.hit("c", "10/second")).allowed
+            await asyncio.sleep(1.05)
+        return denied
+
+    assert asyncio.run(main()) == 0
+
+def test_local_admits_are_logged_in_redis(redis):
+    async def main():
+        lim = _limiter(redis, local_lease=4, local_ttl=1.0)
+        decisions = [await lim.hit("c", "100/minute") for _ in range(10)]
+        await _settle(lim)
+        (key,) = await redis.keys("rl:*")
+        return decisions, await redis.zcard(key)
+
+    decisions, logged = asyncio.run(main())
+    assert all(d.allowed for d in decisions)
+    assert logged == 10  # every admitted request counts once, none phantom
+
+def test_denied_client_gets_retry_after(redis):
+    async def main():
+        lim = _limiter(redis, local_lease=0)
+        for _ in range(3):
+            await lim.hit("c", "3/minute")
+        return await lim.hit("c", "3/minute")
+
+    d = asyncio.run(main())
+    assert not d.allowed and 0 < d.retry_after <= 60
+
+def test_redis_errors_fall_back_to_a_per_worker_window():
+    class Broken:
+        def register_script(self, _src):
+            async def run(**_kw):
+                raise ConnectionError("down")
+            return run
+
+    async def main():
+        lim = _limiter(Broken())
+        return [await lim.hit("c", "3/minute") for _ in range(4)], await lim.hit("other", "3/minute")
+
+    decisions, other = asyncio.run(main())
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert 0 < decisions[-1].retry_after <= 60
+    assert other.allowed
+
+def test_default_limit_is_counted_per_route(redis):
+    lim = _limiter(redis, default="2/minute", local_lease=0)
+    app = FastAPI(dependencies=[Depends(lim.default_limit)])
+
+    @app.get("/a")
+    async def a():
+        return {}
+
+    @app.get("/b")
+    async def b():
+        return {}
+
+    @app.get("/own", dependencies=[Depends(lim.limit("5/minute"))])
+    async def own():
+        return {}
+
+    @app.get("/manual", dependencies=[Depends(lim.checked_in_handler("5/minute"))])
+    async def manual(request: Request):
+        await lim.check(request, "5/minute", "manual")
+        return {}
+
+    with TestClient(app) as c:
+        assert [c.get("/a").status_code for _ in range(3)] == [200, 200, 429]
+        assert [c.get("/b").status_code for _ in range(2)] == [200, 200]  # /a's traffic doesn't spend /b's budget
+        assert [c.get("/own").status_code for _ in range(5)] == [200] * 5
+        assert [c.get("/manual").status_code for _ in range(6)] == [200] * 5 + [429]
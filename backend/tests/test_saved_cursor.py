@@ -0,0 +1,73 @@
+# backend/tests/test_saved_cursor.py
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models_db import SavedSearch
+from app.routers.saved_searches import _decode_cursor, _encode_cursor, list_saved
+
+def _row(id: int, created_at: dt.datetime) -> SavedSearch:
+    row = SavedSearch(name=f"s{id}", params={})
+    row.id = id
+    row.created_at = created_at
+    return row
+
+@pytest.mark.parametrize("order", ["id", "created_at"])
+@pytest.mark.parametrize("dir", ["asc", "desc"])
+def test_cursor_round_trip(order, dir):
+    ts = dt.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt.timezone.utc)
+    cursor = _encode_cursor(_row(42, ts), order, dir)
+    assert "=" not in cursor  # opaque, URL-safe, unpadded
+    assert _decode_cursor(cursor, order, dir) == ((ts if order == "created_at" else None), 42)
+
+def test_legacy_numeric_cursor_for_id_order():
+    assert _decode_cursor("17", "id", "desc") == (None, 17)
+
+def test_no_cursor_means_first_page():
+    assert _decode_cursor(None, "id", "desc") is None
+    assert _decode_cursor("", "created_at", "asc") is None
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", "WzEsMl0"])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(cursor, "created_at", "desc")
+    assert exc.value.status_code == 400
+
+def test_cursor_from_another_order_or_dir_is_rejected():
+    cursor = _encode_cursor(_row(7, dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)), "created_at", "desc")
+    for order, dir in (("created_at", "asc"), ("id", "desc")):
+        with pytest.raises(HTTPException) as exc:
+            _decode_cursor(cursor, order, dir)
+        assert exc.value.status_code == 400
+
+@pytest.mark.parametrize("dir", ["desc", "asc"])
+def test_created_at_pages_cover_legacy_sqlite_rows(tmp_path, monkeypatch, dir):
+    engine = create_engine(f"sqlite:///{tmp_path / 'saved.db'}")
+    db.Base.metadata.create_all(engine)
+    with engine.begin() as conn:  # rows stamped by the old CURRENT_TIMESTAMP default, all in one second
+        for i in range(1, 7):
+            conn.exec_driver_sql(
+                "INSERT INTO saved_searches (id, name, params, created_at) VALUES (?, ?, '{}', '2024-05-01 12:00:00')",
+                (i, f"s{i}"),
+            )
+    monkeypatch.setattr(db, "_engine", engine)
+    monkeypatch.setattr(db, "IS_SQLITE", True)
+    db.create_all()
+
+    seen, cursor = [], None
+    with Session(engine) as session:
+        session.add(SavedSearch(name="new", params={}))  # current format, a later second
+        session.commit()
+        for _ in range(10):
+            page = list_saved(q=None, match="contains", limit=2, cursor=cursor, order="created_at", dir=dir, db=session)
+            seen += [row.id for row in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    assert seen == ([7, 6, 5, 4, 3, 2, 1] if dir == "desc" else [1, 2, 3, 4, 5, 6, 7])
@@ -0,0 +1,104 @@
+# backend/tests/test_singleflight.py
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+
+from app.singleflight import SingleFlight
+
+_caller: ContextVar[str] = ContextVar("caller", default="none")
+
+def test_concurrent_calls_share_one_run(redis):
+    runs = 0
+
+    async def fn():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return {"n": runs}
+
+    async def main():
+        sf = SingleFlight(redis)
+        return await asyncio.gather(*(sf.do("k", fn) for _ in range(10)))
+
+    assert asyncio.run(main()) == [{"n": 1}] * 10
+    assert runs == 1
+
+def test_followers_in_other_workers_get_the_leaders_result(redis):
+    runs = 0
+
+    async def fn():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.1)
+        return [runs, "body"]
+
+    async def main():
+        workers = [SingleFlight(redis, poll_interval=0.01) for _ in range(3)]
+        return await asyncio.gather(*(w.do("k", fn) for w in workers))
+
+    assert asyncio.run(main()) == [[1, "body"]] * 3
+    assert runs == 1
+
+def test_follower_never_reads_a_previous_flights_result(redis):
+    async def main():
+        a, b = SingleFlight(redis, poll_interval=0.01), SingleFlight(redis, poll_interval=0.01)
+
+        async def old():
+            return "old"
+        assert await a.do("k", old) == "old"  # result stays published for result_ttl_ms
+
+        async def new():
+            await asyncio.sleep(0.1)
+            return "new"
+        leader = asyncio.create_task(a.do("k", new))
+        await asyncio.sleep(0.02)
+        return await asyncio.gather(leader, b.do("k", old))
+
+    assert asyncio.run(main()) == ["new", "new"]
+
+def test_flight_does_not_run_in_the_first_callers_context(redis):
+    seen = []
+
+    async def fn():
+        seen.append(_caller.get())
+        _caller.set("flight")  # must not leak back to the callers either
+        await asyncio.sleep(0.05)
+        return 1
+
+    async def call(sf: SingleFlight, name: str):
+        _caller.set(name)
+        await sf.do("k", fn)
+        return _caller.get()
+
+    async def main():
+        sf = SingleFlight(redis)
+        return await asyncio.gather(call(sf, "background"), call(sf, "interactive"))
+
+    assert asyncio.run(main()) == ["background", "interactive"]
+    assert seen == ["none"]
+
+def test_scopes_get_separate_in_worker_flights(redis):
+    runs = []
+
+    async def fn():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return len(runs)
+
+    async def main():
+        sf = SingleFlight(redis, lease_ms=0)
+        return await asyncio.gather(sf.do("k", fn, scope="interactive"), sf.do("k", fn, scope="background"))
+
+    asyncio.run(main())
+    assert len(runs) == 2
+
+def test_redis_down_still_runs_fn():
+    class Broken:
+        async def set(self, *a, **kw):
+            raise ConnectionError("down")
+
+    async def fn():
+        return "ok"
+
+    assert asyncio.run(SingleFlight(Broken()).do("k", fn)) == "ok"